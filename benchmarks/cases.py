@@ -0,0 +1,281 @@
+"""
+Benchmark cases. Each case is a setup function registered under a name which returns
+the zero-argument function to time, or ``None`` if the case can't run here.
+"""
+import datetime as dt
+import os
+import subprocess
+import sys
+
+import wr_schemas
+from wr_schemas import Field, Mappings, Schema
+
+benchmarks = {}
+
+WIDTHS = (10, 50, 200)
+
+
+def benchmark(name):
+    def decorator(setup):
+        benchmarks[name] = setup
+        return setup
+    return decorator
+
+
+def make_schema(width, **schema_kwargs):
+    """
+    A schema of ``width`` fields: a mix of optional strings, ints with limits,
+    fields with defaults and fields with source names.
+    """
+    fields = []
+    for i in range(width):
+        kind = i % 4
+        if kind == 0:
+            fields.append(Field('s{}'.format(i), max_len=100))
+        elif kind == 1:
+            fields.append(Field('i{}'.format(i), mapping=int, min=0, max=10 ** 6))
+        elif kind == 2:
+            fields.append(Field('d{}'.format(i), default=0))
+        else:
+            fields.append(Field('n{}'.format(i), source_name='N{}'.format(i)))
+    return Schema(*fields, **schema_kwargs)
+
+
+def make_payload(schema, fraction=1.0):
+    payload = {}
+    fields = schema.fields[:max(1, int(len(schema.fields) * fraction))]
+    for f in fields:
+        key = f.source_names[0] if f.source_names else f.name
+        payload[key] = '123' if f.name[0] in 'id' else 'value'
+    return payload
+
+
+def _field_load(field, value):
+    def setup():
+        return lambda: field.load(value)
+    return setup
+
+
+for _name, _field, _value in [
+    ('plain', Field('f'), 'value'),
+    ('none', Field('f'), None),
+    ('mapping_int', Field('f', mapping=int), '123'),
+    ('max_len', Field('f', max_len=20), 'value'),
+    ('min_len', Field('f', min_len=2), 'value'),
+    ('auto_trim', Field('f', max_len=3, auto_trim=True), 'value'),
+    ('min_max', Field('f', mapping=int, min=0, max=1000), '123'),
+    ('choices', Field('f', choices=['one', 'two', 'three', 'value']), 'value'),
+    ('regex', Field('f', regex=r'^[a-zA-Z0-9_\-\.@]+$'), 'marcus.aurelius@rome.gov'),
+    ('all', Field(
+        'f', min_len=2, max_len=100, choices=['value', 'other'], regex=r'^[a-z]+$',
+    ), 'value'),
+]:
+    benchmark('field.load.{}'.format(_name))(_field_load(_field, _value))
+
+
+def _schema_load(width, fraction):
+    def setup():
+        schema = make_schema(width)
+        payload = make_payload(schema, fraction)
+        return lambda: schema.load(payload)
+    return setup
+
+
+def _schema_dump(width):
+    def setup():
+        schema = make_schema(width)
+        value = schema.load(make_payload(schema))
+        return lambda: schema.dump(value)
+    return setup
+
+
+for _width in WIDTHS:
+    benchmark('schema.load.w{}.full'.format(_width))(_schema_load(_width, 1.0))
+    benchmark('schema.load.w{}.sparse'.format(_width))(_schema_load(_width, 0.05))
+    benchmark('schema.dump.w{}'.format(_width))(_schema_dump(_width))
+
+
+@benchmark('schema.load.nested')
+def schema_load_nested():
+    item = Schema(Field('sku', required=True), Field('quantity', mapping=int, min=1), Field('note', default=None))
+    order = Schema(Field('id', mapping=int), Field('items', mapping=Mappings.list(item)))
+    payload = {'id': '1', 'items': [{'sku': 'x{}'.format(i), 'quantity': '2'} for i in range(100)]}
+    return lambda: order.load(payload)
+
+
+@benchmark('schema.load.x1000')
+def schema_load_x1000():
+    schema = make_schema(10)
+    rows = [make_payload(schema)] * 1000
+    return lambda: [schema.load(row) for row in rows]
+
+
+@benchmark('schema.dump.x1000')
+def schema_dump_x1000():
+    schema = make_schema(10)
+    values = [schema.load(make_payload(schema))] * 1000
+    return lambda: [schema.dump(value) for value in values]
+
+
+@benchmark('schema.load_many.x1000')
+def schema_load_many_x1000():
+    schema = make_schema(10)
+    if not hasattr(schema, 'load_many'):
+        return None
+    rows = [make_payload(schema)] * 1000
+    return lambda: schema.load_many(rows)
+
+
+@benchmark('schema.dump_many.x1000')
+def schema_dump_many_x1000():
+    schema = make_schema(10)
+    if not hasattr(schema, 'dump_many'):
+        return None
+    values = [schema.load(make_payload(schema))] * 1000
+    return lambda: schema.dump_many(values)
+
+
+def _forget_derived(*objs):
+    # derivations are cached, see wr_schemas.utils.derive
+    for obj in objs:
+        obj.__dict__.pop('_derived', None)
+
+
+@benchmark('schema.reverse.w50')
+def schema_reverse():
+    schema = make_schema(50)
+
+    def reverse():
+        _forget_derived(schema, *schema.fields)
+        return schema.reverse()
+
+    return reverse
+
+
+@benchmark('schema.reverse.w50.cached')
+def schema_reverse_cached():
+    schema = make_schema(50)
+    return schema.reverse
+
+
+@benchmark('field.clone')
+def field_clone():
+    field = Field('f', mapping=int, min=0, max=100, source_name='F', default=0)
+    return field.clone
+
+
+@benchmark('field.map_as')
+def field_map_as():
+    field = Field('f', mapping=int, min=0, max=100, default=0)
+
+    def map_as():
+        _forget_derived(field)
+        return field.map_as('g')
+
+    return map_as
+
+
+@benchmark('field.map_as.cached')
+def field_map_as_cached():
+    field = Field('f', mapping=int, min=0, max=100, default=0)
+    return lambda: field.map_as('g')
+
+
+@benchmark('mappings.list.int.1000')
+def mappings_list_int():
+    mapping = Mappings.list(int)
+    values = [str(i) for i in range(1000)]
+    return lambda: mapping.load(values)
+
+
+@benchmark('mappings.list.int.dump.1000')
+def mappings_list_int_dump():
+    mapping = Mappings.list(int)
+    values = list(range(1000))
+    return lambda: mapping.dump(values)
+
+
+@benchmark('mappings.list.date.100')
+def mappings_list_date():
+    mapping = Mappings.list(Mappings.date())
+    values = ['2018-01-{:02d}'.format(i % 28 + 1) for i in range(100)]
+    return lambda: mapping.load(values)
+
+
+@benchmark('mappings.date')
+def mappings_date():
+    mapping = Mappings.date()
+    return lambda: mapping.load('2018-12-31')
+
+
+@benchmark('mappings.datetime')
+def mappings_datetime():
+    mapping = Mappings.datetime()
+    return lambda: mapping.load('2018-12-31 16:55:33')
+
+
+@benchmark('mappings.datetime.3_formats')
+def mappings_datetime_formats():
+    mapping = Mappings.datetime('%Y-%m-%dT%H:%M:%S', '%d.%m.%Y %H:%M', '%Y-%m-%d %H:%M:%S')
+    return lambda: mapping.load('2018-12-31 16:55:33')
+
+
+@benchmark('mappings.datetime.dump')
+def mappings_datetime_dump():
+    mapping = Mappings.datetime()
+    value = dt.datetime(2018, 12, 31, 16, 55, 33)
+    return lambda: mapping.dump(value)
+
+
+def _run_python(code):
+    # A fresh interpreter that imports wr_schemas from this checkout
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(wr_schemas.__file__)))
+    return lambda: subprocess.run([sys.executable, '-c', code], cwd=cwd, check=True)
+
+
+# startup.import minus startup.interpreter is the time it takes to import wr_schemas
+benchmark('startup.interpreter')(lambda: _run_python('pass'))
+benchmark('startup.import')(lambda: _run_python('import wr_schemas'))
+
+
+@benchmark('startup.build.1000_fields')
+def startup_build_1000_fields():
+    # 20 schemas of 50 fields each
+    return lambda: [make_schema(50) for _ in range(20)]
+
+
+@benchmark('startup.build.w1000')
+def startup_build_w1000():
+    return lambda: make_schema(1000)
+
+
+def _from_request(request):
+    def setup():
+        try:
+            from flask import Flask
+
+            from wr_schemas.flask_request import FlaskRequestSchemaMixin
+        except ImportError:
+            return None
+
+        schema = make_schema(50, mixins=[FlaskRequestSchemaMixin])
+        app = Flask(__name__)
+        context = app.test_request_context(**request(schema))
+
+        # the context is pushed only while the benchmark runs, so that the next one starts without it
+        def from_request():
+            with context:
+                return schema.from_request()
+        return from_request
+    return setup
+
+
+benchmark('flask.from_request.args')(_from_request(
+    lambda schema: dict(query_string=make_payload(schema, 0.2)),
+))
+benchmark('flask.from_request.json')(_from_request(
+    lambda schema: dict(method='POST', json=make_payload(schema, 0.5)),
+))
+benchmark('flask.from_request.form')(_from_request(
+    lambda schema: dict(method='POST', data=make_payload(schema, 0.5)),
+))
@@ -0,0 +1,120 @@
+"""
+Benchmarks of wr_schemas hot paths.
+
+Run all benchmarks and save the results::
+
+    python -m benchmarks.run -o before.json
+
+Run a subset (names are matched as substrings)::
+
+    python -m benchmarks.run schema.load
+
+Compare two result files, exits with status 1 if anything got slower than the threshold::
+
+    python -m benchmarks.run --compare before.json after.json --threshold 1.1
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+
+import wr_schemas
+
+from .cases import benchmarks
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def measure(func, repeat=5, min_time=0.2):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    timings = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def run(selected=(), repeat=5, min_time=0.2, stream=sys.stderr):
+    results = {}
+    for name, setup in sorted(benchmarks.items()):
+        if selected and not any(s in name for s in selected):
+            continue
+        func = setup()
+        if func is None:
+            print('{:<50} skipped'.format(name), file=stream)
+            continue
+        results[name] = measure(func, repeat=repeat, min_time=min_time)
+        print('{:<50} {:>12.2f} us'.format(name, results[name]['min'] * 1e6), file=stream)
+    return {
+        'meta': {
+            'commit': get_commit(),
+            'version': wr_schemas.__version__,
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+        },
+        'results': results,
+    }
+
+
+def compare(before, after, threshold=1.1, stream=sys.stdout):
+    """
+    Prints the ratio of ``after`` to ``before`` timings for every benchmark
+    present in both, returns the names of benchmarks slower than ``threshold``.
+    """
+    regressions = []
+    for name in sorted(set(before['results']) & set(after['results'])):
+        ratio = after['results'][name]['min'] / before['results'][name]['min']
+        flag = ''
+        if ratio > threshold:
+            flag = 'SLOWER'
+            regressions.append(name)
+        elif ratio < 1 / threshold:
+            flag = 'faster'
+        print('{:<50} {:>8.3f} {}'.format(name, ratio, flag), file=stream)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks of wr_schemas hot paths')
+    parser.add_argument('selected', nargs='*', help='run only benchmarks whose name contains any of these')
+    parser.add_argument('-o', '--output', help='write results as JSON to this file')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='approximate seconds per repeat')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='compare two result files')
+    parser.add_argument('--threshold', type=float, default=1.1)
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            before = json.load(f)
+        with open(args.compare[1]) as f:
+            after = json.load(f)
+        return 1 if compare(before, after, threshold=args.threshold) else 0
+
+    results = run(args.selected, repeat=args.repeat, min_time=args.min_time)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
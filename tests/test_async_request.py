@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+from wr_schemas import Field, Mappings, Schema
+from wr_schemas.async_request import AsgiRequest, AsyncRequestSchemaMixin
+
+
+class UserSchema(Schema, AsyncRequestSchemaMixin):
+    fields = (
+        Field('username', required=True),
+        Field('password', source_name='Password'),
+        Field('dob', mapping=Mappings.date(), default=None)
+    )
+
+
+async def app(scope, receive, send):
+    schema = UserSchema()
+    try:
+        user = await schema.from_request(AsgiRequest(scope, receive), **scope.get('extras', {}))
+        status, body = 200, schema.dump(user)
+    except Field.Error as e:
+        status, body = 400, {'name': e.name, 'reason': e.reason}
+
+    await send({'type': 'http.response.start', 'status': status, 'headers': [(b'content-type', b'application/json')]})
+    await send({'type': 'http.response.body', 'body': json.dumps(body).encode()})
+
+
+def call(method='GET', query_string=b'', content_type=None, body_chunks=(b'',), **extras):
+    scope = {
+        'type': 'http',
+        'method': method,
+        'path': '/',
+        'query_string': query_string,
+        'headers': [(b'content-type', content_type.encode())] if content_type else [],
+        'extras': extras,
+    }
+    messages = [
+        {'type': 'http.request', 'body': chunk, 'more_body': i < len(body_chunks) - 1}
+        for i, chunk in enumerate(body_chunks)
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(app(scope, receive, send))
+    finally:
+        loop.close()
+
+    return sent[0]['status'], json.loads(sent[1]['body'].decode())
+
+
+def test_request_args():
+    assert call(query_string=b'username=user&Password=pass&dob=1994-07-29') == (200, {
+        'username': 'user', 'Password': 'pass', 'dob': '1994-07-29',
+    })
+    assert call(query_string=b'Password=pass') == (400, {'name': 'username', 'reason': 'required'})
+
+
+def test_request_json_body_in_chunks():
+    body = json.dumps({'username': 'user', 'Password': 'pass', 'dob': '1994-07-29'}).encode()
+    status, user = call(
+        method='POST',
+        query_string=b'Password=RealPassword',
+        content_type='application/json; charset=utf-8',
+        body_chunks=(body[:10], body[10:20], body[20:]),
+        dob='1995-11-10',
+    )
+    assert status == 200
+    assert user == {'username': 'user', 'Password': 'RealPassword', 'dob': '1995-11-10'}
+
+
+def test_request_form():
+    status, user = call(
+        method='POST',
+        content_type='application/x-www-form-urlencoded',
+        body_chunks=(b'username=user&Password=pa%20ss',),
+    )
+    assert status == 200
+    assert user == {'username': 'user', 'Password': 'pa ss', 'dob': None}
@@ -0,0 +1,120 @@
+import pytest
+
+from wr_schemas import Field, Schema
+from wr_schemas.batch import numpy
+from wr_schemas.mappings import Mapping
+
+
+def make_schema():
+    return Schema(
+        Field('id', mapping=int, min=1, required=True),
+        Field('score', mapping=float, max=10, default=None),
+        Field('size', choices=['S', 'M', 'L'], source_names=['size', 'Size']),
+    )
+
+
+def test_load_many_matches_load():
+    schema = make_schema()
+    rows = [
+        {'id': '1', 'score': '2.5', 'size': 'S'},
+        {'id': 2, 'Size': 'M'},
+        {'id': 3, 'size': 'L', 'Size': 'S'},
+    ]
+    assert schema.load_many(rows) == [schema.load(row) for row in rows]
+    assert schema.load_many(iter(rows)) == [schema.load(row) for row in rows]
+
+
+def test_load_many_reports_errors_per_row():
+    schema = make_schema()
+    rows = [
+        {'id': 1, 'score': 11},
+        {'id': 0},
+        {'id': 3, 'size': 'XL'},
+        {'score': 1},
+        {'id': 5},
+    ]
+
+    with pytest.raises(Field.Invalid) as exc_info:
+        schema.load_many(rows)
+    assert exc_info.value.row == 0
+    assert exc_info.value.name == 'score'
+    assert exc_info.value.reason == 'max'
+
+    assert schema.load_many(rows, errors='skip') == [{'id': 5, 'score': None}]
+
+    errors = []
+    assert schema.load_many(rows, errors=errors) == [{'id': 5, 'score': None}]
+    assert errors == [
+        (0, 'score', 'max'),
+        (1, 'id', 'min'),
+        (2, 'size', 'choices'),
+        (3, 'id', 'required'),
+    ]
+
+
+def test_load_many_columns():
+    schema = make_schema()
+    columns = {'id': ['1', '2', '0'], 'Size': ['S', 'M', 'L']}
+
+    errors = []
+    loaded = schema.load_many(columns, as_columns=True, errors=errors)
+    assert errors == [(2, 'id', 'min')]
+    assert list(loaded['id']) == [1, 2]
+    assert list(loaded['score']) == [None, None]
+    assert list(loaded['size']) == ['S', 'M']
+
+    assert schema.load_many(columns, errors='skip') == [
+        {'id': 1, 'score': None, 'size': 'S'},
+        {'id': 2, 'score': None, 'size': 'M'},
+    ]
+
+    with pytest.raises(ValueError):
+        schema.load_many({'id': [1, 2], 'size': ['S']})
+
+
+def test_load_many_maps_columns_of_mappings_in_one_batch():
+    calls = []
+
+    def code_of(raw_value):
+        calls.append(raw_value)
+        return raw_value.strip().upper()
+
+    class Prefixed(Mapping):
+        def load(self, raw_value):
+            return 'x-' + super().load(raw_value)
+
+    schema = Schema(
+        Field('code', mapping=Mapping(code_of), max_len=3),
+        Field('name', mapping=Mapping(str.strip)),
+        Field('ref', mapping=Prefixed(str), default=None),
+    )
+    rows = [{'code': ' ab ', 'name': ' x ', 'ref': 1}, {'code': 'abcd', 'name': 'y'}, {'code': 'c', 'name': ' z'}]
+
+    errors = []
+    assert schema.load_many(rows, errors=errors) == [
+        {'code': 'AB', 'name': 'x', 'ref': 'x-1'},
+        {'code': 'C', 'name': 'z', 'ref': None},
+    ]
+    assert errors == [(1, 'code', 'max_len')]
+    assert calls == [' ab ', 'abcd', 'c']
+
+    # a value that the mapping fails on is reported for its row, the others are mapped one by one
+    del calls[:]
+    rows[1]['code'] = 5
+    errors = []
+    assert schema.load_many(rows, errors=errors) == [schema.load(rows[0]), schema.load(rows[2])]
+    assert errors == [(1, 'code', 'mapping')]
+    assert calls == [' ab ', 5, ' ab ', 5, 'c', ' ab ', 'c']
+
+
+@pytest.mark.skipif(numpy is None, reason='numpy is not installed')
+def test_load_many_vectorised_columns_are_arrays():
+    schema = Schema(Field('id', mapping=int, max=2), Field('score', mapping=float))
+    loaded = schema.load_many({'id': ['1', '2', '3'], 'score': [1, 2, 3]}, as_columns=True, errors='skip')
+    assert isinstance(loaded['id'], numpy.ndarray)
+    assert loaded['id'].tolist() == [1, 2]
+    assert loaded['score'].tolist() == [1.0, 2.0]
+
+    rows = schema.load_many([{'id': 1, 'score': 1}, {'id': None, 'score': 'x'}], errors=[])
+    assert rows == [{'id': 1, 'score': 1.0}]
+    assert type(rows[0]['id']) is int
@@ -0,0 +1,141 @@
+import datetime as dt
+import fractions
+import importlib
+import pickle
+import re
+
+import pytest
+
+from wr_schemas import Field, Mappings, NestedField, NestedListField, Schema
+from wr_schemas.codegen import generate, main
+from wr_schemas.mappings import Mapping
+
+line_item = Schema(
+    Field('sku', required=True, regex=r'^[A-Z]+$'),
+    Field('quantity', mapping=int, min=1, max=100, default=1, source_names=['qty', 'count']),
+)
+
+order = Schema(
+    Field('id', mapping=int, required=True, nullable=False),
+    Field('code', max_len=3, auto_trim=True),
+    Field('status', choices=['new', 'paid'], default='new'),
+    Field('tags', mapping=Mappings.list(), default_factory=list),
+    Field('created', mapping=Mappings.datetime('%d.%m.%Y', '%Y-%m-%d')),
+    Field('name', mapping=Mapping(str.strip).append(Mapping(str.lower))),
+    Field('note', mapping=lambda raw: raw.upper(), default=None),
+    Field('secret', forbidden=True),
+    NestedField('first', line_item, default=None),
+    NestedListField('lines', line_item, default=None),
+)
+
+ranked = Schema(
+    Field('rank', mapping=int, choices=range(3), max=fractions.Fraction(3, 2)),
+    Field('grade', mapping=int, choices=[fractions.Fraction(1, 2), 1]),
+)
+
+
+@pytest.fixture
+def import_generated(tmpdir, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmpdir))
+
+    def import_generated(code, name):
+        tmpdir.join(name + '.py').write(code)
+        return importlib.import_module(name)
+
+    return import_generated
+
+
+def test_generated_module_loads_and_dumps_like_the_schema(import_generated):
+    generated = import_generated(generate(order, source='tests.test_codegen:order'), 'generated_order')
+
+    payload = {
+        'id': '7',
+        'code': 'ABCDE',
+        'created': '31.12.2017',
+        'name': '  Marcus ',
+        'note': 'x',
+        'first': {'sku': 'A'},
+        'lines': [{'sku': 'B', 'qty': '2'}, {'sku': 'C', 'count': 3}],
+        'unknown': 1,
+    }
+    loaded = generated.load(payload)
+    assert loaded == order.load(payload)
+    assert loaded['created'] == dt.datetime(2017, 12, 31)
+    assert loaded['tags'] == [] and loaded['tags'] is not generated.load(payload)['tags']
+    assert generated.dump(loaded) == order.dump(loaded)
+    assert generated.dump(order.load(payload)) == order.dump(loaded)
+
+    invalid_payloads = [
+        {},
+        {'id': None},
+        {'id': 'x'},
+        {'id': 1, 'status': 'old'},
+        {'id': 1, 'secret': 's'},
+        {'id': 1, 'lines': [{'sku': 'B'}, {'sku': 'b'}]},
+        {'id': 1, 'first': {'sku': 'A', 'qty': 0}},
+        {'id': 1, 'lines': 'B'},
+    ]
+    for invalid in invalid_payloads:
+        with pytest.raises(Field.Error) as expected:
+            order.load(invalid)
+        with pytest.raises(type(expected.value)) as actual:
+            generated.load(invalid)
+        assert (actual.value.name, actual.value.reason) == (expected.value.name, expected.value.reason)
+
+    assert pickle.loads(pickle.dumps(generated.load)) is generated.load
+
+
+def test_codegen_needs_source_for_lambdas(import_generated):
+    with pytest.raises(ValueError):
+        generate(order)
+
+    generated = import_generated(generate(line_item), 'generated_line_item')
+    assert generated.load({'sku': 'A', 'count': '5'}) == {'sku': 'A', 'quantity': 5}
+    assert 'fields' not in generate(line_item)
+
+
+def test_codegen_writes_none_aware_mappings_as_code(import_generated):
+    schema = Schema(
+        Field('ids', mapping=Mappings.list(Mappings.int)),
+        Field('name', mapping=Mappings.str.append(Mapping(str.lower))),
+        Field('ratios', mapping=Mappings.list(Mappings.float)),
+    )
+    code = generate(schema)
+    assert re.search(r'\b_schema\b', code) is None
+
+    generated = import_generated(code, 'generated_none_aware')
+    payload = {'ids': ['1', None], 'name': 'Marcus', 'ratios': ['0.5']}
+    assert generated.load(payload) == schema.load(payload) == {'ids': [1, None], 'name': 'marcus', 'ratios': [0.5]}
+    assert generated.dump(schema.load(payload)) == schema.dump(schema.load(payload))
+    assert generated.load({'name': None}) == {'name': None}
+
+
+def test_codegen_of_derived_schema(import_generated):
+    schema = Schema(NestedField('first', line_item, default=None).map_as('primary'))
+    generated = import_generated(generate(schema), 'generated_derived')
+    payload = {'first': {'sku': 'A', 'qty': '2'}}
+    assert generated.load(payload) == schema.load(payload) == {'primary': {'sku': 'A', 'quantity': 2}}
+
+
+def test_codegen_refers_to_limits_and_choices_that_are_not_literals(import_generated):
+    with pytest.raises(ValueError):
+        generate(ranked)
+
+    generated = import_generated(generate(ranked, source='tests.test_codegen:ranked'), 'generated_ranked')
+    assert generated.load({'rank': '1', 'grade': 1}) == ranked.load({'rank': '1', 'grade': 1})
+    for invalid in ({'rank': '2'}, {'rank': '-1'}, {'grade': 2}):
+        with pytest.raises(Field.Invalid) as expected:
+            ranked.load(invalid)
+        with pytest.raises(Field.Invalid) as actual:
+            generated.load(invalid)
+        assert actual.value.reason == expected.value.reason
+
+
+def test_codegen_command(tmpdir):
+    output = tmpdir.join('out.py')
+    main(['tests.test_codegen:line_item', '-o', str(output)])
+    assert 'def load(dct):' in output.read()
+
+    for schema in ('tests.test_codegen', 'tests.test_codegen:', 'a:b:c'):
+        with pytest.raises(SystemExit):
+            main([schema])
@@ -1,6 +1,10 @@
 import datetime as dt
+import json
 
-from wr_schemas import Field, Mappings, Schema
+import pytest
+
+from wr_schemas import Field, Mappings, Record, Schema, jsonio
+from wr_schemas.mappings import Mapping
 
 
 def test_primitive_fields():
@@ -57,3 +61,61 @@ def test_list_of_dates_serialization():
     list_of_dates = [dt.datetime(2018, 1, 1), dt.datetime(2018, 2, 1), dt.datetime(2018, 3, 1)]
     mapping = Field(name='dates', mapping=Mappings.list(Mappings.date()))
     assert mapping.dump(list_of_dates) == ['2018-01-01', '2018-02-01', '2018-03-01']
+
+
+def test_dump_many():
+    person = Schema(
+        Field('name'),
+        Field('weight', mapping=int, source_name='weight_in_kgs'),
+        Field('dob', mapping=Mappings.date(), default=None),
+    )
+    people = [
+        {'name': 'A', 'weight': '60', 'dob': dt.datetime(2000, 1, 1)},
+        {'weight': None},
+        None,
+        person.load({'name': 'B'}),
+    ]
+    assert person.dump_many(people) == [person.dump(p) for p in people] == [
+        {'name': 'A', 'weight_in_kgs': 60, 'dob': '2000-01-01'},
+        {'weight_in_kgs': None},
+        None,
+        {'name': 'B', 'dob': None},
+    ]
+    assert person.dump_many([{'weight': True}]) == [{'weight_in_kgs': 1}]
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_dump_json(use_orjson, monkeypatch):
+    if not use_orjson:
+        monkeypatch.setattr(jsonio, 'orjson_dumps', None)
+    elif jsonio.orjson_dumps is None:
+        pytest.skip('orjson is not installed')
+
+    person = Schema(
+        Field('name', source_name='full "name"'),
+        Field('age', mapping=int),
+        Field('height', mapping=float),
+        Field('active', mapping=bool),
+        Field('born', mapping=Mappings.date()),
+        Field('tags', mapping=Mappings.list()),
+    )
+    value = {'name': 'Jānis', 'age': 30, 'height': 1.8, 'active': True, 'born': dt.datetime(1990, 1, 2), 'tags': ['a']}
+
+    assert json.loads(person.dump_json(value)) == person.dump(value)
+    assert json.loads(person.dump_json({'name': None})) == {'full "name"': None}
+    assert person.dump_json(None) == b'null'
+    assert json.loads(person.dump_json_many([value, {}])) == [person.dump(value), {}]
+
+    record_schema = Schema(Field('age', mapping=int), instance_factory=Record)
+    assert json.loads(record_schema.dump_json(record_schema.load({'age': '5'}))) == {'age': 5}
+
+    counts = Schema(Field('total', mapping=int), Field('by_id', mapping=Mapping(dict, dict)), Field('ratio', mapping=float))
+    value = {'total': 2 ** 70, 'by_id': {1: 2}}
+    assert counts.dump_json(value) == json.dumps(value, separators=(',', ':')).encode()
+    assert counts.dump_json_many([value]) == json.dumps([value], separators=(',', ':')).encode()
+    assert counts.dump_json({'ratio': float('nan')}) == (b'{"ratio":null}' if use_orjson else b'{"ratio":NaN}')
+
+    names = Schema(Field('name'))
+    assert names.dump_json({'name': 'Jānis'}) == (
+        '{"name":"Jānis"}'.encode() if use_orjson else json.dumps({'name': 'Jānis'}, separators=(',', ':')).encode()
+    )
@@ -1,4 +1,8 @@
 import datetime as dt
+import decimal
+import os
+import subprocess
+import sys
 
 import pytest
 
@@ -270,3 +274,94 @@ def test_map_as_accepts_reverse():
     g = f.map_as('x_str', reverse=True)
     assert g(5) == '5'
     assert g.dump('5') == 5
+
+
+def test_field_choices():
+    f = Field(name='colour', choices=['red', 'green'])
+    assert f.load('red') == 'red'
+
+    with pytest.raises(Field.Invalid) as exc_info:
+        f.load('blue')
+    assert exc_info.value.reason == 'choices'
+
+    g = Field(name='tags', mapping=list, choices=[['a'], ['b']])
+    assert g.load(['a']) == ['a']
+
+    h = Field(name='tags', mapping=list, choices=['a', 'b'])
+    with pytest.raises(Field.Invalid):
+        h.load(['a'])
+
+
+def test_field_compile_rebuilds_constraints():
+    f = Field(name='code', regex=r'^[a-z]+$')
+    with pytest.raises(Field.Invalid):
+        f.load('ABC')
+
+    f.regex = r'^[A-Z]+$'
+    f.max_len = 2
+    f.compile()
+    with pytest.raises(Field.Invalid) as exc_info:
+        f.load('ABC')
+    assert exc_info.value.reason == 'max_len'
+    assert f.load('AB') == 'AB'
+
+
+def test_field_default_is_copied_only_if_mutable():
+    items = Field(name='items', default=[], mapping=list)
+    assert items.default == []
+    assert items.default is not items.default
+
+    point = Field(name='point', default=(1, 2), mapping=tuple)
+    assert point.default is point.default
+
+    assert Field(name='x', default=None).default is None
+    assert Field(name='x').default is Field.nothing
+
+    when = Field(name='when', default=dt.date(2019, 1, 1), mapping=Mappings.date())
+    assert when.default is when.default
+    amount = Field(name='amount', default=decimal.Decimal('1.5'), mapping=decimal.Decimal)
+    assert amount.default is amount.default
+
+    class Options:
+        pass
+
+    options = Field(name='options', default=Options(), mapping=Options)
+    assert isinstance(options.default, Options)
+    assert options.default is not options.default
+
+
+def test_fields_of_same_type_share_mapping():
+    assert Field('a').mapping is Field('b').mapping
+    assert Field('a', mapping=int).mapping is Field('b', mapping=int).mapping
+    assert Field('a', default=0).mapping is Field('b', default=1).mapping
+    assert Field('a', default=0).mapping is not Field('b', mapping=int).mapping
+    assert Field('a', default=0).dump(5) == '5'
+
+
+def test_import_does_not_load_modules_used_on_demand():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = (
+        'import sys; import wr_schemas; '
+        'print(" ".join(m for m in ("copy", "datetime", "decimal", "json", "re") if m in sys.modules))'
+    )
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=root)
+    assert output.decode().strip() == ''
+
+
+def test_field_default_factory():
+    f = Field(name='tags', default_factory=list, mapping=list)
+    assert f.default == []
+    assert f.default is not f.default
+    assert f.clone().default_factory is list
+    assert f.clone(default=None).default is None
+
+    with pytest.raises(ValueError):
+        Field(name='tags', default=[], default_factory=list)
+
+    tags = Field(name='tags', default_factory=list)
+    assert tags.load(('a',)) == ['a']
+    assert tags.clone().load(['b']) == ['b']
+    assert Field(name='count', default_factory=int).load('5') == 5
+    with pytest.raises(ValueError):
+        Field(name='tags', default_factory=lambda: ['a'])
+    assert Field(name='tags', default_factory=lambda: ['a'], mapping=list).default == ['a']
@@ -107,3 +107,24 @@ def test_schema_instance_on_the_fly():
     assert isinstance(schema, FlaskRequestSchemaMixin)
     assert schema.f.username
     assert schema.f.password
+
+
+def test_source_precedence_applies_across_source_names(flask_app):
+    schema = Schema(
+        Field('password', source_names=['password', 'Password']),
+        Field('tags', default=None),
+        mixins=[FlaskRequestSchemaMixin],
+    )
+    request = dict(
+        method='POST',
+        query_string='password=from_args',
+        content_type='application/json',
+        data=json.dumps({'password': 'from_body'}),
+    )
+    with flask_app.test_request_context(**request):
+        assert schema.from_request() == {'password': 'from_args', 'tags': None}
+        assert schema.from_request(Password='from_extras') == {'password': 'from_extras', 'tags': None}
+
+    request = dict(method='POST', content_type='application/json', data=json.dumps(['password']))
+    with flask_app.test_request_context(**request):
+        assert schema.from_request() == {'tags': None}
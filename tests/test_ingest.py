@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from wr_schemas import Field, Record, Schema
+from wr_schemas.ingest import load_file
+
+users = Schema(
+    Field('id', mapping=int, min=1, required=True),
+    Field('name', source_name='full_name'),
+)
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_load_jsonl_file(tmpdir, workers):
+    path = tmpdir.join('users.jsonl')
+    path.write_binary(b''.join([
+        b'{"id": 1, "full_name": "a", "extra": [1, 2]}\n',
+        b'\n',
+        b'{"id": 0}\n',
+        b'not json\n',
+        b'{"id": "2"}',
+    ]))
+    valid_path = tmpdir.join('valid.jsonl')
+    rejected_path = tmpdir.join('rejected.jsonl')
+
+    result = load_file(
+        users, str(path), valid=str(valid_path), rejected=str(rejected_path), workers=workers, chunk_size=10,
+    )
+    assert result == (2, 2)
+    assert [json.loads(line) for line in valid_path.read_binary().splitlines()] == [
+        {'id': 1, 'full_name': 'a'},
+        {'id': 2},
+    ]
+    assert [json.loads(line) for line in rejected_path.read_binary().splitlines()] == [
+        {'line': 2, 'field': 'id', 'reason': 'min', 'raw': '{"id": 0}'},
+        {'line': 3, 'field': None, 'reason': 'json', 'raw': 'not json'},
+    ]
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_load_csv_file(tmpdir, workers):
+    path = tmpdir.join('users.csv')
+    path.write_binary(b'full_name,id\r\n"b, c",1\r\nd,x\r\ne\r\nf,3\r\n')
+
+    schema = Schema(*users.fields, instance_factory=Record)
+    loaded = []
+    rejected = []
+    result = load_file(
+        schema, str(path), format='csv', valid=loaded.append, rejected=lambda *args: rejected.append(args),
+        workers=workers, chunk_size=5,
+    )
+    assert result == (2, 2)
+    assert loaded == [{'id': 1, 'name': 'b, c'}, {'id': 3, 'name': 'f'}]
+    assert isinstance(loaded[0], Record)
+    assert rejected == [(2, 'id', 'mapping', b'd,x\r'), (3, None, 'csv', b'e\r')]
+
+
+def test_load_empty_file(tmpdir):
+    path = tmpdir.join('empty.jsonl')
+    path.write_binary(b'')
+    assert load_file(users, str(path)) == (0, 0)
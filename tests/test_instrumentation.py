@@ -0,0 +1,84 @@
+import pickle
+
+import pytest
+
+from wr_schemas import Field, Schema
+from wr_schemas.instrumentation import Collector
+
+
+def test_instrumented_schema_reports_to_collector():
+    schema = Schema(
+        Field('id', mapping=int, min=1),
+        Field('name', required=True),
+    )
+    collector = Collector()
+    schema.instrument(collector, name='user')
+
+    assert schema.load({'id': '1', 'name': 'x'}) == {'id': 1, 'name': 'x'}
+    assert schema({'id': '2', 'name': 'y'}).id == 2
+    with pytest.raises(Field.Invalid):
+        schema.load({'id': '0', 'name': 'x'})
+    with pytest.raises(Field.Invalid):
+        schema.load({'id': 'x'})
+    assert schema.try_load({'id': '5'}) == (None, [('name', 'required')])
+    assert schema.dump({'id': 1, 'name': 'x'}) == {'id': 1, 'name': 'x'}
+
+    assert schema.try_load({'id': 'y', 'name': 'x'}) == (None, [('id', 'mapping')])
+
+    assert collector.counter('invalid_values_total', field='id') == 3
+    assert collector.counter('invalid_values_total', reason='required') == 1
+    assert collector.counter('mapping_errors_total', exception='ValueError') == 2
+
+    tags = (('schema', 'user'), ('field', 'id'))
+    assert collector.histograms[('field_load_seconds', tags)].count == 4
+    assert collector.histograms[('field_dump_seconds', tags)].count == 1
+    assert collector.histograms[('schema_load_seconds', (('schema', 'user'),))].count == 6
+    assert collector.histograms[('payload_keys', (('schema', 'user'),))].sum == 10
+    assert collector.histograms[('payload_keys', (('schema', 'user'),))].quantile(0.99) == 2
+
+    text = collector.prometheus()
+    assert '# TYPE wr_schemas_invalid_values_total counter' in text
+    assert 'wr_schemas_invalid_values_total{schema="user",field="id",reason="min"} 1' in text
+    assert 'wr_schemas_field_load_seconds_count{schema="user",field="id"} 4' in text
+    assert 'wr_schemas_payload_keys_bucket{schema="user",le="+Inf"} 6' in text
+
+    # instrumentation is not pickled
+    assert pickle.loads(pickle.dumps(schema))._instrumentation is None
+
+    schema.instrument(None)
+    assert 'load' not in schema.__dict__
+    schema.load({'id': '1', 'name': 'x'})
+    assert collector.histograms[('schema_load_seconds', (('schema', 'user'),))].count == 6
+
+
+def test_instrumented_derived_schema():
+    schema = Schema(Field('id', mapping=int), Field('secret'))
+    public = schema.without('secret')
+    collector = Collector()
+    public.instrument(collector, name='public')
+
+    assert public.load({'id': '1', 'secret': 's'}) == {'id': 1}
+    with pytest.raises(Field.Invalid):
+        public.load({'id': 'x'})
+    assert public.try_load({'id': 'y'}) == (None, [('id', 'mapping')])
+    assert collector.counter('mapping_errors_total', schema='public', exception='ValueError') == 2
+    assert collector.histograms[('schema_load_seconds', (('schema', 'public'),))].count == 3
+
+    # the schema it is derived from isn't instrumented
+    schema.load({'id': '1'})
+    assert collector.histograms[('schema_load_seconds', (('schema', 'public'),))].count == 3
+
+    public.instrument(None)
+    assert 'load' not in public.__dict__
+    assert public is schema.without('secret')
+
+
+def test_callback_sink():
+    measurements = []
+    schema = Schema(Field('id', mapping=int)).instrument(lambda *args: measurements.append(args))
+    schema.load({'id': '1'})
+    assert [(kind, metric) for kind, metric, value, tags in measurements] == [
+        ('histogram', 'payload_keys'),
+        ('timing', 'field_load_seconds'),
+        ('timing', 'schema_load_seconds'),
+    ]
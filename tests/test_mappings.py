@@ -1,4 +1,5 @@
 import datetime as dt
+import pickle
 
 import pytest
 
@@ -67,3 +68,96 @@ def test_composite_mapping():
     n = m.reverse()
     assert n(555) == '555'
     assert n.dump('555') == 555
+
+
+def test_appended_mappings_are_flattened():
+    strip = Mapping(str.strip)
+    m = strip.append(Mapping(str.lower)).append(Mappings.int).append(Mapping.none_aware_for(float))
+    assert len(m.stages) == 4
+    assert m(' 12 ') == 12.0
+    assert m.dump(12.0) == '12'
+
+    n = Mappings.int.append(Mappings.float)
+    assert n(None) is None
+    assert n('3') == 3.0
+    assert n.dump(None) is None
+
+    r = m.reverse()
+    assert len(r.stages) == 4
+    assert r.dump(' 12 ') == 12.0
+
+    p = pickle.loads(pickle.dumps(m))
+    assert p(' 7 ') == 7.0
+
+
+def test_datetime_mapping_fast_and_lenient_formats():
+    m = Mappings.datetime()
+    assert m('2018-12-31 16:55:33') == dt.datetime(2018, 12, 31, 16, 55, 33)
+    # not zero-padded and extra whitespace are handled by strptime
+    assert m('2018-1-2 3:4:5') == dt.datetime(2018, 1, 2, 3, 4, 5)
+    assert m('2018-01-02  03:04:05') == dt.datetime(2018, 1, 2, 3, 4, 5)
+    for invalid in ['2018-13-01 00:00:00', '2018-02-30 00:00:00', '2018-01-01T00:00:00', '2018-01-01']:
+        with pytest.raises(ValueError):
+            m(invalid)
+
+    m = Mappings.date('%d.%m.%Y', '%Y%m%d', '%H:%M %d/%m/%Y')
+    assert m('31.12.2017') == dt.datetime(2017, 12, 31)
+    assert m('20171231') == dt.datetime(2017, 12, 31)
+    assert m('12:30 31/12/2017') == dt.datetime(2017, 12, 31, 12, 30)
+    assert m('01.01.2018') == dt.datetime(2018, 1, 1)
+    with pytest.raises(ValueError):
+        m('2017-12-31')
+
+
+def test_datetime_mapping_load_many():
+    m = Mappings.date('%d.%m.%Y', '%Y-%m-%d')
+    values = ['31.12.2017', '2018-01-01', dt.date(2018, 1, 2), '1.2.2018']
+    expected = [dt.datetime(2017, 12, 31), dt.datetime(2018, 1, 1), dt.datetime(2018, 1, 2), dt.datetime(2018, 2, 1)]
+    assert m.load_many(values) == expected
+    assert m.reverse().load_many(expected[:2]) == ['31.12.2017', '01.01.2018']
+
+    schema = Schema(Field('day', mapping=m, min=dt.datetime(2018, 1, 1)))
+    errors = []
+    assert schema.load_many([{'day': v} for v in values + ['x']], errors=errors) == [{'day': d} for d in expected[1:]]
+    assert errors == [(0, 'day', 'min'), (4, 'day', 'mapping')]
+
+    # strings all in the last matched format are parsed together
+    assert m.load_many(['31.12.2017', '01.01.2018']) == [dt.datetime(2017, 12, 31), dt.datetime(2018, 1, 1)]
+    assert Mappings.datetime('%H:%M %d/%m/%Y').load_many(['12:30 31/12/2017']) == [dt.datetime(2017, 12, 31, 12, 30)]
+    iso = Mappings.date()
+    assert iso.load_many(['2018-01-01', '2018-1-2']) == [dt.datetime(2018, 1, 1), dt.datetime(2018, 1, 2)]
+    with pytest.raises(ValueError):
+        iso.load_many(['2018-01-01\n2018-01-02', '2018-01-03'])
+    with pytest.raises(ValueError):
+        iso.load_many(['2018-13-01'])
+
+
+def test_list_mapping_of_primitive_items():
+    ids = Mappings.list(int)
+    assert ids(('1', '2')) == [1, 2]
+    assert ids.dump([1, 2]) == [1, 2]
+
+    with pytest.raises(ValueError):
+        ids(['1', 'x'])
+
+    optional_ids = Mappings.list(Mappings.int)
+    assert optional_ids(['1', None]) == [1, None]
+    assert optional_ids.dump([1, None]) == [1, None]
+    assert optional_ids(x for x in ['1', None, '2']) == [1, None, 2]
+    assert ids(x for x in ['1', '2']) == [1, 2]
+
+    compact_ids = Mappings.list(int, as_array='array')
+    assert compact_ids(['1', '2']).typecode == 'q'
+    assert compact_ids.dump(compact_ids(['1', '2'])) == [1, 2]
+    assert pickle.loads(pickle.dumps(compact_ids))(['3']).tolist() == [3]
+
+    with pytest.raises(ValueError):
+        Mappings.list(str, as_array='array')
+
+
+def test_list_mapping_to_numpy_array():
+    numpy = pytest.importorskip('numpy')
+    weights = Mappings.list(float, as_array='numpy')
+    loaded = weights(['1.5', 2])
+    assert isinstance(loaded, numpy.ndarray)
+    assert weights.dump(loaded) == [1.5, 2.0]
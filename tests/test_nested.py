@@ -0,0 +1,92 @@
+import pickle
+
+import pytest
+
+from wr_schemas import Field, Mappings, NestedField, NestedListField, Schema
+
+line_item = Schema(
+    Field('sku', required=True),
+    Field('quantity', mapping=int, min=1, source_name='qty'),
+)
+
+customer = Schema(
+    Field('name', required=True),
+    Field('email', regex=r'^[^@]+@[^@]+$'),
+)
+
+order = Schema(
+    Field('id', mapping=int),
+    NestedField('customer', customer, required=True),
+    NestedListField('lines', line_item, default=None, max_len=2),
+    Field('created', mapping=Mappings.date()),
+)
+
+payload = {
+    'id': '1',
+    'customer': {'name': 'marcus', 'email': 'marcus@rome.gov'},
+    'lines': [{'sku': 'a', 'qty': '2'}, {'sku': 'b'}],
+    'created': '2018-01-01',
+}
+
+
+def test_nested_fields_load_and_dump():
+    loaded = order.load(payload)
+    assert loaded.customer.name == 'marcus'
+    assert loaded.lines[0].quantity == 2
+    assert loaded.lines[1] == {'sku': 'b'}
+
+    dumped = dict(payload, id=1, lines=[{'sku': 'a', 'qty': 2}, {'sku': 'b'}])
+    assert order.dump(loaded) == dumped == order.dump_many([loaded])[0]
+    assert order.reverse().load(loaded) == dumped
+
+    assert order.load({'customer': {'name': 'x'}}).lines is None
+
+
+def test_nested_field_errors_have_paths():
+    with pytest.raises(Field.Missing) as exc_info:
+        order.load({'customer': {'email': 'x@y'}})
+    assert exc_info.value.name == 'customer.name'
+    assert exc_info.value.reason == 'required'
+
+    with pytest.raises(Field.Invalid) as exc_info:
+        order.load(dict(payload, lines=[{'sku': 'a'}, {'sku': 'b', 'qty': '0'}]))
+    assert exc_info.value.name == 'lines.1.quantity'
+    assert exc_info.value.reason == 'min'
+
+    with pytest.raises(Field.Invalid) as exc_info:
+        order.load(dict(payload, lines=[{'sku': 'a'}, 'b']))
+    assert exc_info.value.name == 'lines.1'
+
+    with pytest.raises(Field.Invalid) as exc_info:
+        order.load(dict(payload, lines=[{'sku': 'a'}] * 3))
+    assert exc_info.value.name == 'lines'
+    assert exc_info.value.reason == 'max_len'
+
+    assert order.try_load({'customer': 'marcus', 'lines': [{'qty': 'x'}, 5]}) == (None, [
+        ('customer', 'mapping'),
+        ('lines.0.sku', 'required'),
+        ('lines.0.quantity', 'mapping'),
+        ('lines.1', 'mapping'),
+    ])
+
+
+def test_nested_fields_can_be_pickled():
+    loaded = pickle.loads(pickle.dumps(order)).load(payload)
+    assert loaded == order.load(payload)
+
+
+def test_schema_as_field_mapping_is_dumped_with_the_schema():
+    schema = Schema(Field('customer', mapping=customer))
+    assert schema.dump(schema.load(payload)) == {'customer': payload['customer']}
+
+
+def test_nested_schema_fields_changed_after_compiling():
+    inner = Schema(Field('a'))
+    outer = Schema(NestedField('one', inner), NestedListField('many', inner))
+    assert outer.load({'one': {'a': '1', 'b': '2'}}) == {'one': {'a': '1'}}
+
+    inner.fields.append(Field('b'))
+    assert outer.load({'one': {'a': '1', 'b': '2'}, 'many': [{'b': '3'}]}) == {
+        'one': {'a': '1', 'b': '2'},
+        'many': [{'b': '3'}],
+    }
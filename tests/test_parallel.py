@@ -0,0 +1,74 @@
+import datetime as dt
+import pickle
+
+import pytest
+
+from wr_schemas import Field, Mappings, Record, Schema
+from wr_schemas.flask_request import FlaskRequestSchemaMixin
+from wr_schemas.mappings import Mapping
+
+address = Schema(Field('city', required=True))
+
+
+class Event(Schema):
+    instance_factory = Record
+    fields = [
+        Field('id', mapping=int, min=1, required=True),
+        Field('at', mapping=Mappings.datetime(), source_name='timestamp'),
+        Field('days', mapping=Mappings.list(Mappings.date().reverse())),
+        Field('name', mapping=Mapping(str.strip).append(Mapping(str.lower)), regex=r'^[a-z]+$'),
+        Field('address', mapping=address, default=None),
+        Field('count', default=0),
+    ]
+
+
+def test_schemas_can_be_pickled():
+    event = Event(mixins=[FlaskRequestSchemaMixin])
+    payload = {
+        'id': '1',
+        'timestamp': '2018-01-01 12:00:00',
+        'days': [dt.datetime(2018, 1, 1)],
+        'name': ' Name ',
+        'address': {'city': 'Riga'},
+    }
+
+    copy = pickle.loads(pickle.dumps(event))
+    assert isinstance(copy, FlaskRequestSchemaMixin)
+    assert type(copy) is type(event)
+    assert copy.f.id.name == 'id'
+    assert copy.load(payload) == event.load(payload) == {
+        'id': 1,
+        'at': dt.datetime(2018, 1, 1, 12),
+        'days': ['2018-01-01'],
+        'name': 'name',
+        'address': {'city': 'Riga'},
+        'count': 0,
+    }
+    assert copy.dump(copy.load(payload)) == event.dump(event.load(payload))
+
+    assert pickle.loads(pickle.dumps(Field.nothing)) is Field.nothing
+    assert copy.load_many([{}], errors=[]) == []
+
+    exc = pickle.loads(pickle.dumps(Field.Invalid('id', reason='min')))
+    assert isinstance(exc, Field.Invalid)
+    assert (exc.name, exc.reason) == ('id', 'min')
+
+
+def test_parallel_load():
+    event = Event()
+    rows = [{'id': i} for i in range(1, 50)]
+
+    loaded = event.parallel_load(rows, workers=2, chunksize=7)
+    assert [e.id for e in loaded] == list(range(1, 50))
+
+    rows[10] = {'id': 0}
+    rows[40] = {}
+    errors = []
+    loaded = list(event.parallel_load(iter(rows), workers=2, chunksize=7, errors=errors))
+    assert len(loaded) == 47
+    assert isinstance(loaded[0], Record)
+    assert errors == [(10, 'id', 'min'), (40, 'id', 'required')]
+
+    with pytest.raises(Field.Invalid) as exc_info:
+        list(event.parallel_load(rows, workers=2, chunksize=7))
+    assert exc_info.value.row == 10
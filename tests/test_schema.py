@@ -1,8 +1,9 @@
 import datetime as dt
+import pickle
 
 import pytest
 
-from wr_schemas import Field, Mappings, Schema
+from wr_schemas import Field, LazyRecord, Mappings, Record, Schema
 
 
 def test_fields_passed_as_args():
@@ -85,3 +86,343 @@ def test_instance_factory_on_the_fly():
     assert isinstance(person, Person)
     assert person.name is None
     assert person.date_of_birth == dt.datetime(1995, 10, 11)
+
+
+def test_load_extras_take_precedence_over_source_names():
+    schema = Schema(
+        Field('password', source_names=['password', 'Password']),
+        Field('token', forbidden=True),
+        Field('age', default=0),
+    )
+
+    assert schema.load({'Password': 'a'}) == {'password': 'a', 'age': 0}
+    assert schema.load({'password': 'a', 'Password': 'b'}) == {'password': 'a', 'age': 0}
+    assert schema.load({'password': 'a'}, Password='c', age='5') == {'password': 'c', 'age': 5}
+
+    with pytest.raises(Field.Forbidden):
+        schema.load({}, token='t')
+
+
+def test_changed_fields_are_picked_up():
+    schema = Schema(Field('a'), Field('b'))
+    assert schema.load({'a': 'x'}) == {'a': 'x'}
+
+    schema.fields.append(Field('c', default='z'))
+    assert schema.load({'a': 'x'}) == {'a': 'x', 'c': 'z'}
+    assert schema.f.c.name == 'c'
+
+    schema.fields[0] = Field('d', mapping=int)
+    assert schema.dump({'d': 1, 'a': 'x'}) == {'d': 1}
+    assert schema.load_many([{'d': '5'}]) == [{'d': 5, 'c': 'z'}]
+
+    schema.fields = (Field('e'),)
+    assert schema.load({'e': 'y', 'a': 'x'}) == {'e': 'y'}
+    assert schema.dump_json({'e': 'y', 'a': 'x'}) == b'{"e":"y"}'
+
+    records = Schema(Field('a'), instance_factory=Record)
+    records.fields.append(Field('b'))
+    assert records.load({'a': 'x', 'b': 'y'}).b == 'y'
+
+
+@pytest.mark.parametrize('chunk_size', [None, 2])
+def test_iter_load(chunk_size):
+    schema = Schema(Field('id', mapping=int, min=1, required=True))
+    consumed = []
+
+    def rows():
+        for row in [{'id': '1'}, {'id': '0'}, {}, {'id': 4}]:
+            consumed.append(row)
+            yield row
+
+    loaded = schema.iter_load(rows(), errors='skip', chunk_size=chunk_size)
+    assert next(loaded) == {'id': 1}
+    assert len(consumed) == (chunk_size or 1)
+    assert list(loaded) == [{'id': 4}]
+
+    errors = []
+    assert list(schema.iter_load(iter([{'id': 0}, {'id': 2}, {}]), errors=errors, chunk_size=chunk_size)) == [
+        {'id': 2},
+    ]
+    assert errors == [(0, 'id', 'min'), (2, 'id', 'required')]
+
+    loaded = []
+    with pytest.raises(Field.Missing) as exc_info:
+        for instance in schema.iter_load([{'id': 1}, {'id': 2}, {'id': 3}, {}, {'id': 5}], chunk_size=chunk_size):
+            loaded.append(instance)
+    assert exc_info.value.row == 3
+    assert loaded == [{'id': 1}, {'id': 2}, {'id': 3}]
+
+
+def test_iter_dump():
+    schema = Schema(Field('weight', mapping=int, source_name='weight_in_kgs'))
+    dumped = schema.iter_dump(iter([{'weight': '60'}, {'weight': None}]))
+    assert next(dumped) == {'weight_in_kgs': 60}
+    assert list(dumped) == [{'weight_in_kgs': None}]
+
+
+def test_collect_errors():
+    address = Schema(Field('city', required=True), Field('zip', mapping=int))
+    schema = Schema(
+        Field('id', mapping=int, min=1),
+        Field('name', required=True),
+        Field('email', regex=r'^[^@]+@[^@]+$'),
+        Field('secret', forbidden=True),
+        Field('address', mapping=address),
+    )
+
+    assert schema.load({'id': '1', 'name': 'x'}, collect_errors=True) == ({'id': 1, 'name': 'x'}, None)
+
+    payload = {
+        'id': '0',
+        'email': 'nope',
+        'secret': 's',
+        'address': {'zip': 'LV-1010'},
+    }
+    assert schema.load(payload, collect_errors=True) == (None, [
+        ('id', 'min'),
+        ('name', 'required'),
+        ('email', 'regex'),
+        ('secret', 'forbidden'),
+        ('address.city', 'required'),
+        ('address.zip', 'mapping'),
+    ])
+    assert schema.try_load({'id': 'x'}, name='n') == (None, [('id', 'mapping')])
+    assert schema.try_load({'name': 'n', 'address': 5}) == (None, [('address', 'mapping')])
+
+
+def test_field_try_load():
+    f = Field('id', mapping=int, max=5, nullable=False)
+    assert f.try_load('5') == (5, None)
+    assert f.try_load('6') == (None, [('id', 'max')])
+    assert f.try_load(None) == (None, [('id', 'nullable')])
+
+
+def test_record_instance_factory():
+    person = Schema(
+        Field('name'),
+        Field('weight', mapping=int, source_name='weight_in_kgs'),
+        Field('dob', mapping=Mappings.date(), default=None),
+        instance_factory=Record,
+    )
+
+    p = person.load({'weight_in_kgs': '60'})
+    assert isinstance(p, Record)
+    assert not hasattr(p, '__dict__')
+    assert p.weight == 60
+    assert p.dob is None
+    assert 'name' not in p
+    with pytest.raises(AttributeError):
+        assert p.name
+    assert p == {'weight': 60, 'dob': None}
+    assert repr(p) == 'SchemaRecord(weight=60, dob=None)'
+
+    assert person.dump(p) == {'weight_in_kgs': 60, 'dob': None}
+
+    with pytest.raises(ValueError):
+        Schema(Field('first-name'), instance_factory=Record)
+
+
+def test_sparse_payload_is_loaded_like_dense_payload():
+    fields = [Field('f{}'.format(i), mapping=int) for i in range(20)]
+    schema = Schema(
+        Field('password', source_names=['password', 'Password']),
+        *fields,
+        Field('token', forbidden=True),
+        Field('age', default=0),
+        Field('id', required=True),
+    )
+
+    loaded = schema.load({'id': 'x', 'f3': '3', 'Password': 'b', 'password': 'a'})
+    assert list(loaded.items()) == [('password', 'a'), ('f3', 3), ('age', 0), ('id', 'x')]
+
+    with pytest.raises(Field.Missing):
+        schema.load({'f3': '3'})
+
+    with pytest.raises(Field.Invalid) as exc_info:
+        schema.load({'id': 'x', 'f5': 'five', 'token': 't'})
+    assert exc_info.value.name == 'f5'
+
+    assert schema.f.f19 is fields[19]
+    assert schema.f['age'].default == 0
+    with pytest.raises(KeyError):
+        assert schema.f['Password']
+
+
+def test_default_factory_is_called_per_load():
+    calls = []
+
+    def make_tags():
+        calls.append(1)
+        return []
+
+    schema = Schema(Field('tags', mapping=list, default_factory=make_tags), instance_factory=None)
+    first = schema.load({})
+    second = schema.load({})
+    assert first == {'tags': []}
+    assert first['tags'] is not second['tags']
+    assert len(calls) == 2
+    assert schema.load({'tags': ['a']}) == {'tags': ['a']}
+    assert len(calls) == 2
+
+
+def test_lazy_load():
+    calls = []
+
+    def parse_id(raw_value):
+        calls.append(raw_value)
+        return int(raw_value)
+
+    schema = Schema(
+        Field('id', mapping=parse_id, min=1),
+        Field('name', required=True),
+        Field('secret', forbidden=True),
+        Field('tags', mapping=list, default_factory=list),
+        Field('note'),
+    )
+
+    with pytest.raises(Field.Missing):
+        schema.load({'id': 'x'}, lazy=True)
+    with pytest.raises(Field.Forbidden):
+        schema.load({'name': 'n', 'secret': 's'}, lazy=True)
+
+    record = schema.load({'id': '5', 'name': 'n'}, lazy=True)
+    assert isinstance(record, LazyRecord)
+    assert calls == []
+    assert record.id == 5
+    assert record['id'] == 5
+    assert calls == ['5']
+    assert record.tags == []
+    assert 'note' not in record
+    with pytest.raises(AttributeError):
+        record.note
+    assert record == {'id': 5, 'name': 'n', 'tags': []}
+    assert calls == ['5']
+    assert schema.dump(record) == {'id': '5', 'name': 'n', 'tags': '[]'}
+
+    invalid = schema.load({'id': '0', 'name': 'n'}, lazy=True)
+    assert invalid.name == 'n'
+    with pytest.raises(Field.Invalid) as exc_info:
+        invalid.validate_all()
+    assert exc_info.value.reason == 'min'
+
+    # another first access while the first one is loading the value, as from another thread
+    loads = []
+
+    def load_twice(raw_value):
+        loads.append(raw_value)
+        if len(loads) == 1:
+            assert racing.value == raw_value
+        return raw_value
+
+    racing = Schema(Field('value', mapping=load_twice)).load({'value': 'x'}, lazy=True)
+    assert racing.value == 'x'
+    assert loads == ['x', 'x']
+    assert racing == {'value': 'x'}
+
+
+def test_derived_schemas_and_fields_are_cached():
+    person = Schema(Field('name', source_name='full_name'), Field('age', mapping=int), Field('secret'))
+
+    assert person.reverse() is person.reverse()
+    assert person.reverse().load({'name': 'x'}) == {'full_name': 'x'}
+    assert person.f.name.map_as('n') is person.f.name.map_as('n')
+    assert person.f.name.map_as('n', required=True) is not person.f.name.map_as('n')
+    assert person.f.age.reverse() is person.reverse().fields[1] is not person.f.age.reverse(required=True)
+
+    public = person.without('secret')
+    assert public is person.without('secret')
+    assert [f.name for f in public.fields] == ['name', 'age']
+
+    reversed_person = person.reverse()
+    person.compile()
+    assert person.reverse() is not reversed_person
+
+
+def test_derived_fields_are_cached_by_type_of_arguments():
+    f = Field('a', mapping=int)
+    assert f.map_as('x', default=1).default == 1
+    assert f.map_as('x', default=True).default is True
+    assert f.reverse(default=0.0).default == 0.0 and type(f.reverse(default=0).default) is int
+
+
+def test_derived_schemas_and_fields_are_immutable():
+    person = Schema(Field('name', source_name='full_name'), Field('age', mapping=int))
+
+    mapped = person.f.name.map_as('n')
+    with pytest.raises(AttributeError):
+        mapped.max_len = 1
+    assert mapped.compile().load('x') == 'x'
+    with pytest.raises(TypeError):
+        mapped.source_names.append('other')
+    assert mapped.source_names == ['name']
+
+    reversed_person = person.reverse()
+    with pytest.raises(TypeError):
+        reversed_person.fields.append(Field('extra'))
+    with pytest.raises(AttributeError):
+        reversed_person.instance_factory = None
+    assert reversed_person.compile().load({'name': 'x'}) == {'full_name': 'x'}
+
+    measurements = []
+    reversed_person.instrument(lambda *measurement: measurements.append(measurement))
+    assert reversed_person.load({'name': 'x'}) == {'full_name': 'x'}
+    assert ('timing', 'schema_load_seconds') in [measurement[:2] for measurement in measurements]
+    reversed_person.instrument(None)
+    assert 'load' not in reversed_person.__dict__
+    assert [f.name for f in person.reverse().fields] == ['full_name', 'age']
+
+    # new ones made from them can be changed
+    changed = mapped.clone(max_len=1)
+    changed.max_len = 2
+    assert isinstance(changed, Field)
+    assert reversed_person.reverse().reverse() is reversed_person.reverse().reverse()
+    assert Schema(*reversed_person.fields).load({'name': 'x'}) == {'full_name': 'x'}
+
+    copy = pickle.loads(pickle.dumps(reversed_person))
+    copy.fields.append(Field('extra'))
+    copy.compile()
+    assert copy.load({'extra': 'x'})['extra'] == 'x'
+
+
+def test_load_json():
+    schema = Schema(Field('id', mapping=int, min=1), Field('name', default=None))
+    assert schema.load_json(b'{"id": "5", "unknown": {"deep": [1, 2]}}') == {'id': 5, 'name': None}
+    assert schema.load_json('{"id": 5}', name='x') == {'id': 5, 'name': 'x'}
+
+    for data in (b'{"id": ', b'[1]'):
+        with pytest.raises(Field.Invalid) as exc_info:
+            schema.load_json(data)
+        assert exc_info.value.reason == 'json'
+
+
+def test_load_json_decoder(monkeypatch):
+    from wr_schemas import jsonio
+
+    schema = Schema(Field('id', mapping=int), Field('ratio', mapping=float))
+    assert schema.load_json('{"id": 123456789012345678901234}') == {'id': 123456789012345678901234}
+    assert schema.load_json('{"ratio": NaN}')['ratio'] != 0
+
+    monkeypatch.setattr(jsonio, 'json_loads', None)
+    jsonio.set_json_decoder(lambda data: {'id': '7'})
+    assert schema.load_json('{}') == {'id': 7}
+
+    pytest.importorskip('orjson')
+    jsonio.set_json_decoder('orjson')
+    assert schema.load_json('{"id": 123456789012345678901234}') != {'id': 123456789012345678901234}
+    with pytest.raises(Field.Invalid):
+        schema.load_json('{"ratio": NaN}')
+
+
+def test_iter_load_json(tmpdir):
+    schema = Schema(Field('id', mapping=int, min=1))
+    path = tmpdir.join('rows.jsonl')
+    path.write_binary(b'{"id": 1}\n\n{"id": 0}\nnope\n{"id": "2"}\n')
+
+    errors = []
+    with open(str(path), 'rb') as f:
+        assert list(schema.iter_load_json(f, errors=errors)) == [{'id': 1}, {'id': 2}]
+    assert errors == [(2, 'id', 'min'), (3, None, 'json')]
+
+    with pytest.raises(Field.Invalid) as exc_info:
+        list(schema.iter_load_json(['{"id": 1}', '{"id": 0}']))
+    assert exc_info.value.row == 1
@@ -2,14 +2,19 @@ __version__ = '0.5.0'
 
 from .field import Field
 from .mappings import Mappings
+from .nested import NestedField, NestedListField
 from .schema import Schema
-from .utils import AttrDict
+from .utils import AttrDict, LazyRecord, Record
 from .utils import _nothing as nothing
 
 __all__ = [
     'Field',
+    'NestedField',
+    'NestedListField',
     'Schema',
     'Mappings',
     'AttrDict',
+    'Record',
+    'LazyRecord',
     'nothing',
 ]
@@ -0,0 +1,127 @@
+import json
+from urllib.parse import parse_qsl
+
+from . import jsonio
+from .schema import Schema
+from .utils import merge_sources
+
+_form_types = ('application/x-www-form-urlencoded', 'multipart/form-data')
+
+
+def _first_values(pairs):
+    values = {}
+    for key, value in pairs:
+        values.setdefault(key, value)
+    return values
+
+
+def _mimetype(content_type):
+    return (content_type or '').split(';', 1)[0].strip().lower()
+
+
+class AsgiRequest:
+    """
+    Minimal request of a raw ASGI ``http`` connection, with the parts of the Starlette request interface
+    that :class:`.AsyncRequestSchemaMixin` uses. For apps that don't use a framework.
+    """
+
+    def __init__(self, scope, receive):
+        self.scope = scope
+        self._receive = receive
+        self._body = None
+        self.query_params = _first_values(
+            parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True)
+        )
+        self.headers = _first_values(
+            (k.decode('latin-1').lower(), v.decode('latin-1')) for k, v in scope.get('headers', ())
+        )
+
+    async def body(self):
+        if self._body is None:
+            chunks = []
+            while True:
+                message = await self._receive()
+                if message['type'] == 'http.request':
+                    chunks.append(message.get('body', b''))
+                    if not message.get('more_body', False):
+                        break
+                elif message['type'] == 'http.disconnect':
+                    break
+            self._body = b''.join(chunks)
+        return self._body
+
+    async def form(self):
+        """
+        Only ``application/x-www-form-urlencoded`` bodies are parsed.
+        """
+        if _mimetype(self.headers.get('content-type')) != 'application/x-www-form-urlencoded':
+            return {}
+        body = await self.body()
+        return _first_values(parse_qsl(body.decode('utf-8'), keep_blank_values=True))
+
+
+async def read_request(request):
+    """
+    Returns ``(args, body, form)`` of a Starlette (or :class:`.AsgiRequest`), Quart or aiohttp request.
+    ``body`` is the decoded JSON body if it is a JSON object, otherwise ``None``.
+    """
+    if hasattr(request, 'query_params'):
+        # Starlette, AsgiRequest
+        args = request.query_params
+        content_type = request.headers.get('content-type')
+        read_body = request.body
+        read_form = request.form
+    elif hasattr(request, 'query'):
+        # aiohttp
+        args = request.query
+        content_type = request.content_type
+        read_body = request.read
+        read_form = request.post
+    else:
+        # Quart
+        args = request.args
+        content_type = request.content_type
+
+        async def read_body():
+            return await request.get_data()
+
+        async def read_form():
+            return await request.form
+
+    body = None
+    form = None
+    mimetype = _mimetype(content_type)
+    if mimetype == 'application/json':
+        data = await read_body()
+        if data:
+            body = (jsonio.json_loads or json.loads)(data)
+            if not isinstance(body, dict):
+                body = None
+    elif mimetype in _form_types:
+        form = await read_form()
+
+    return args, body, form
+
+
+class AsyncRequestSchemaMixin:
+    async def from_request(self, request, **extras):
+        """
+        Reads values for fields from the request of an asyncio framework -- Starlette, Quart, aiohttp,
+        or a raw ASGI connection wrapped in :class:`.AsgiRequest`. The body is awaited, the fields are
+        loaded the same way as in :meth:`.FlaskRequestSchemaMixin.from_request` and with the same precedence:
+        `extras`, query string arguments, JSON body, form data.
+        """
+        assert isinstance(self, Schema)
+
+        args, body, form = await read_request(request)
+
+        if self._compiled_fields != self.fields:
+            self.compile()
+
+        merged = merge_sources(extras, args, body, form)
+        content = self._load_resolved(self._resolve_merged(merged))
+
+        if self.instance_factory is None:
+            return content
+        else:
+            return self.instance_factory(**content)
@@ -0,0 +1,224 @@
+from .field import Field, _check_hashable_choices, _check_max, _check_min
+from .utils import _nothing
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+_numeric_kinds = {
+    int: 'biU',
+    float: 'bifU',
+}
+
+
+def _column_of(rows, keys):
+    if len(keys) == 1:
+        key = keys[0]
+        return [row[key] if key in row else _nothing for row in rows]
+
+    column = []
+    for row in rows:
+        for key in keys:
+            if key in row:
+                column.append(row[key])
+                break
+        else:
+            column.append(_nothing)
+    return column
+
+
+def _load_numeric_column(field, values):
+    """
+    Returns ``(array, reasons)`` if the values of a primitive int or float field
+    can be converted and checked with numpy, otherwise ``None``.
+    ``reasons`` maps indices of invalid values to the reason.
+    """
+    if numpy is None or not values or type(field).load is not Field.load:
+        return None
+
+    value_type = field.mapping.extras.get('value_type')
+    if value_type not in _numeric_kinds:
+        return None
+
+    array = numpy.asarray(values)
+    if array.ndim != 1 or array.dtype.kind not in _numeric_kinds[value_type]:
+        return None
+
+    try:
+        array = array.astype(numpy.int64 if value_type is int else numpy.float64)
+
+        reasons = {}
+        valid = numpy.ones(len(array), dtype=bool)
+        for check, arg, reason in field._constraints:
+            if check is _check_max and isinstance(arg, (int, float)):
+                invalid = array > arg
+            elif check is _check_min and isinstance(arg, (int, float)):
+                invalid = array < arg
+            elif check is _check_hashable_choices and all(isinstance(c, (int, float)) for c in arg):
+                invalid = ~numpy.isin(array, list(arg))
+            else:
+                return None
+            for i in numpy.flatnonzero(invalid & valid):
+                reasons[int(i)] = reason
+            valid &= ~invalid
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+    return array, reasons
+
+
+def _load_batched_column(field, present, values, failures):
+    """
+    Loads values with :meth:`.Mapping.load_many` of the field's mapping, and then checks the constraints.
+    Returns ``None`` if the values have to be loaded one by one instead -- if any of them is ``None``,
+    or if the mapping fails on any of them, in which case all of them are mapped again one by one.
+    """
+    if type(field).load is not Field.load or not hasattr(type(field.mapping), 'load_many'):
+        return None
+    if any(raw_value is None for raw_value in values):
+        return None
+
+    try:
+        mapped = field.mapping.load_many(values)
+    except Exception:
+        return None
+
+    if not field._constraints:
+        return mapped
+
+    loaded = []
+    for i, raw_value, value in zip(present, values, mapped):
+        value, reason = field._check(raw_value, value)
+        if reason is not None:
+            failures.setdefault(i, field.Invalid(field.name, reason=reason))
+            value = None
+        loaded.append(value)
+    return loaded
+
+
+def _load_column(field, load, forbidden, required, raw_column, failures):
+    """
+    Loads one field for all rows. Returns the column of loaded values in which rows
+    that don't get a value are set to ``_nothing``. The first error of each row is recorded in ``failures``.
+    """
+    present = [i for i, raw_value in enumerate(raw_column) if raw_value is not _nothing]
+    if len(present) == len(raw_column):
+        values = raw_column
+    else:
+        values = [raw_column[i] for i in present]
+
+    numeric = _load_numeric_column(field, values)
+    if numeric is not None:
+        loaded, reasons = numeric
+        for i, reason in reasons.items():
+            failures.setdefault(present[i], field.Invalid(field.name, reason=reason))
+    else:
+        loaded = _load_batched_column(field, present, values, failures)
+
+    if loaded is None:
+        loaded = []
+        for i, raw_value in zip(present, values):
+            try:
+                loaded.append(load(raw_value))
+            except Field.Error as exc:
+                failures.setdefault(i, exc)
+                loaded.append(None)
+
+    if forbidden:
+        for i in present:
+            failures.setdefault(i, field.Forbidden(field.name, reason='forbidden'))
+
+    if len(present) == len(raw_column):
+        return loaded
+
+    if numeric is not None:
+        loaded = loaded.tolist()
+
+    column = [_nothing] * len(raw_column)
+    for i, value in zip(present, loaded):
+        column[i] = value
+
+    if not forbidden:
+        for i, raw_value in enumerate(raw_column):
+            if raw_value is _nothing:
+                default = field.default
+                if default is not _nothing:
+                    column[i] = default
+                elif required:
+                    failures.setdefault(i, field.Missing(field.name, reason='required'))
+
+    return column
+
+
+def load_many(schema, data, as_columns=False, errors='raise', start=0):
+    """
+    Implementation of :meth:`.Schema.load_many`. ``start`` is the index reported
+    for the first row.
+    """
+    if schema._compiled_fields != schema.fields:
+        schema.compile()
+
+    if isinstance(data, dict):
+        columns = {key: list(column) for key, column in data.items()}
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError('All columns must be of the same length')
+        num_rows = lengths.pop() if lengths else 0
+        raw_columns = []
+        for f, name, keys, load, forbidden, required in schema._load_plan:
+            for key in keys:
+                if key in columns:
+                    raw_columns.append(columns[key])
+                    break
+            else:
+                raw_columns.append([_nothing] * num_rows)
+    else:
+        rows = data if isinstance(data, (list, tuple)) else list(data)
+        num_rows = len(rows)
+        raw_columns = [_column_of(rows, keys) for f, name, keys, load, forbidden, required in schema._load_plan]
+
+    failures = {}
+    loaded_columns = []
+    for (f, name, keys, load, forbidden, required), raw_column in zip(schema._load_plan, raw_columns):
+        loaded_columns.append((name, _load_column(f, load, forbidden, required, raw_column, failures)))
+
+    if failures:
+        if errors == 'raise':
+            i = min(failures)
+            exc = failures[i]
+            exc.row = start + i
+            raise exc
+        elif errors != 'skip':
+            errors.extend((start + i, failures[i].name, failures[i].reason) for i in sorted(failures))
+
+    if as_columns:
+        if not failures:
+            return {
+                name: [None if v is _nothing else v for v in column] if isinstance(column, list) else column
+                for name, column in loaded_columns
+            }
+        valid = [i for i in range(num_rows) if i not in failures]
+        return {
+            name: [None if column[i] is _nothing else column[i] for i in valid]
+            if isinstance(column, list) else column[valid]
+            for name, column in loaded_columns
+        }
+
+    loaded_columns = [
+        (name, column.tolist() if not isinstance(column, list) else column)
+        for name, column in loaded_columns
+    ]
+
+    instances = []
+    for i in range(num_rows):
+        if i in failures:
+            continue
+        content = {}
+        for name, column in loaded_columns:
+            value = column[i]
+            if value is not _nothing:
+                content[name] = value
+        instances.append(content if schema.instance_factory is None else schema.instance_factory(**content))
+    return instances
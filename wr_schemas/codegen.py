@@ -0,0 +1,500 @@
+"""
+Generates a standalone Python module with ``load(dct)`` and ``dump(value)`` functions
+that do the same as :meth:`.Schema.load` and :meth:`.Schema.dump` of a schema, in straight-line code::
+
+    python -m wr_schemas.codegen myapp.schemas:CreateUser -o myapp/create_user.py
+
+Field options and defaults are written as literals. Mappings of primitive types are inlined,
+other mappings are re-created from the functions that built them (including none-aware
+conversions like ``Mappings.int``), or imported. Nested schemas
+(:class:`.NestedField`, :class:`.NestedListField`) get functions of their own.
+Anything that can't be written as code -- for example a lambda as a mapping -- is referenced through
+the schema in its original module, which then has to be importable by the generated module.
+
+The generated functions return dictionaries, whatever the :attr:`.Schema.instance_factory`, and raise the
+same :class:`.Field.Error` exceptions. ``load`` takes no ``extras``.
+"""
+import argparse
+import datetime as dt
+import importlib
+import itertools
+import math
+import sys
+
+from .field import Field
+from .mappings import Mapping, primitive_types
+from .nested import NestedField, NestedListField
+from .utils import mutable_class_of
+
+
+def _importable(obj):
+    """
+    Returns ``(module, qualified name)`` by which ``obj`` can be imported, or ``None``.
+    """
+    module = getattr(obj, '__module__', None)
+    if module is None and hasattr(obj, '__objclass__'):
+        module = obj.__objclass__.__module__
+    qualname = getattr(obj, '__qualname__', None)
+    if not module or not qualname or '<' in qualname:
+        return None
+    try:
+        found = importlib.import_module(module)
+        for part in qualname.split('.'):
+            found = getattr(found, part)
+    except (ImportError, AttributeError):
+        return None
+    if found is not obj and getattr(found, '__func__', None) is not getattr(obj, '__func__', obj):
+        return None
+    return module, qualname
+
+
+class _CodeError(Exception):
+    pass
+
+
+class Generator:
+    def __init__(self, source=None):
+        # "module:attribute" of the schema, for references to what can't be written as code
+        self.source = source
+        self.imports = set()
+        self.constants = []
+        self.functions = []
+        self.generated = {}
+        self.mappings = {}
+        self.counter = itertools.count(1)
+
+    def generate(self, schema):
+        self.schema_functions(schema, '_schema', public=True)
+        lines = [
+            '# Generated by wr_schemas.codegen{}. Do not edit.'.format(
+                ' from {}'.format(self.source) if self.source else ''
+            ),
+        ]
+        lines.extend(sorted(self.imports))
+        lines.append('')
+        lines.append('from wr_schemas.field import Field')
+        lines.append('from wr_schemas.utils import _nothing')
+        if self.source and any('_schema' in constant for constant in self.constants):
+            module, attribute = self.source.split(':')
+            lines.append('from {} import {} as _schema'.format(module, attribute))
+        lines.append('')
+        lines.append('Error = Field.Error')
+        lines.append('Invalid = Field.Invalid')
+        lines.append('Missing = Field.Missing')
+        lines.append('Forbidden = Field.Forbidden')
+        lines.append('')
+        lines.extend(self.constants)
+        lines.append('')
+        lines.append('')
+        lines.append('def _contains(choices, value):')
+        lines.append('    try:')
+        lines.append('        return value in choices')
+        lines.append('    except TypeError:')
+        lines.append('        return False')
+        for function in self.functions:
+            lines.append('')
+            lines.append('')
+            lines.extend(function)
+        return '\n'.join(lines) + '\n'
+
+    def name(self, prefix):
+        return '_{}{}'.format(prefix, next(self.counter))
+
+    def constant(self, expr, prefix='c'):
+        name = self.name(prefix)
+        self.constants.append('{} = {}'.format(name, expr))
+        return name
+
+    def fallback(self, path):
+        if not self.source:
+            raise _CodeError(path)
+        return self.constant(path, 'ref')
+
+    def reference(self, obj):
+        """
+        Returns an expression that imports ``obj``, or ``None``.
+        """
+        found = _importable(obj)
+        if found is None:
+            return None
+        module, qualname = found
+        if module == 'builtins':
+            return qualname
+        alias = '_' + module.replace('.', '_')
+        self.imports.add('import {} as {}'.format(module, alias))
+        return '{}.{}'.format(alias, qualname)
+
+    def literal(self, value):
+        """
+        Returns Python source that evaluates to ``value``, or ``None``.
+        """
+        t = type(value)
+        if value is None or t in (bool, int, str, bytes):
+            return repr(value)
+        if t is float:
+            return repr(value) if math.isfinite(value) else None
+        if t in (dt.date, dt.datetime, dt.time, dt.timedelta) and getattr(value, 'tzinfo', None) is None:
+            self.imports.add('import datetime')
+            return repr(value)
+        if (t.__module__, t.__qualname__) == ('decimal', 'Decimal'):
+            self.imports.add('import decimal')
+            return 'decimal.{!r}'.format(value)
+        if t in (list, tuple, set, frozenset):
+            items = [self.literal(item) for item in value]
+            if any(item is None for item in items):
+                return None
+            if t is list:
+                return '[{}]'.format(', '.join(items))
+            if t is tuple:
+                return '({})'.format(''.join(item + ', ' for item in items))
+            # sorted so that the generated code doesn't depend on the hash seed
+            return '{}([{}])'.format(t.__name__, ', '.join(sorted(items)))
+        if t is dict:
+            items = [(self.literal(k), self.literal(v)) for k, v in value.items()]
+            if any(k is None or v is None for k, v in items):
+                return None
+            return '{{{}}}'.format(', '.join('{}: {}'.format(k, v) for k, v in items))
+        return None
+
+    def value(self, value):
+        """
+        Returns an expression for an argument of a mapping factory, or ``None``.
+        """
+        literal = self.literal(value)
+        if literal is not None:
+            return literal
+        if isinstance(value, Mapping):
+            try:
+                return self.mapping(value, None)
+            except _CodeError:
+                return None
+        return self.none_aware(value) or self.reference(value)
+
+    def none_aware(self, function):
+        """
+        Returns an expression that re-creates a function made by ``none_aware_loader_of``
+        or ``none_aware_dumper_of``, or ``None``.
+        """
+        value_type = getattr(function, 'none_aware_type', None)
+        if value_type is None:
+            return None
+        factory = getattr(function, '__qualname__', '').split('.')[0]
+        if factory not in ('none_aware_loader_of', 'none_aware_dumper_of'):
+            return None
+        type_expr = self.reference(value_type)
+        if type_expr is None:
+            return None
+        self.imports.add('import wr_schemas.mappings as _wr_schemas_mappings')
+        return '_wr_schemas_mappings.{}({})'.format(factory, type_expr)
+
+    def mapping(self, mapping, path):
+        """
+        Returns an expression for ``mapping`` re-created in the generated module.
+        ``path`` is the expression by which the mapping can be found through the schema.
+        """
+        recipe = mapping.__dict__.get('_recipe')
+        if recipe is not None:
+            factory, args, kwargs = recipe
+            factory_expr = self.reference(factory)
+            arg_exprs = [self.value(arg) for arg in args]
+            kwarg_exprs = {key: self.value(arg) for key, arg in kwargs.items()}
+            if factory_expr is not None and None not in arg_exprs and None not in kwarg_exprs.values():
+                return '{}({})'.format(factory_expr, ', '.join(
+                    arg_exprs + ['{}={}'.format(key, expr) for key, expr in kwarg_exprs.items()]
+                ))
+        elif type(mapping) is Mapping and self.is_none_aware_for(mapping):
+            type_expr = self.reference(mapping.extras['value_type'])
+            if type_expr is not None:
+                self.imports.add('import wr_schemas.mappings as _wr_schemas_mappings')
+                return '_wr_schemas_mappings.Mapping.none_aware_for({})'.format(type_expr)
+        elif type(mapping) is Mapping:
+            loader = self.value(mapping.loader)
+            dumper = self.value(mapping.dumper)
+            extras = {key: self.value(value) for key, value in mapping.extras.items()}
+            if loader is not None and dumper is not None and None not in extras.values():
+                self.imports.add('import wr_schemas.mappings as _wr_schemas_mappings')
+                return '_wr_schemas_mappings.Mapping({})'.format(', '.join(
+                    [loader, dumper] + ['{}={}'.format(key, expr) for key, expr in extras.items()]
+                ))
+        if path is None:
+            raise _CodeError(mapping)
+        return self.fallback(path)
+
+    @staticmethod
+    def is_none_aware_for(mapping):
+        """
+        Whether ``mapping`` is the same as ``Mapping.none_aware_for`` its ``value_type``.
+        """
+        value_type = mapping.extras.get('value_type')
+        return value_type is not None and list(mapping.extras) == ['value_type'] and all((
+            mapping.batch_loader is None,
+            getattr(mapping.loader, 'none_aware_type', None) is value_type,
+            getattr(mapping.dumper, 'none_aware_type', None) is value_type,
+        ))
+
+    def mapping_constant(self, mapping, path):
+        """
+        Returns the name of the module-level constant of ``mapping``, created once per mapping.
+        """
+        if id(mapping) not in self.mappings:
+            self.mappings[id(mapping)] = self.constant(self.mapping(mapping, path), 'mapping')
+        return self.mappings[id(mapping)]
+
+    def none_aware_function(self, function):
+        value_type = getattr(function, 'none_aware_type', None)
+        return value_type.__name__ if value_type in primitive_types else None
+
+    def loader(self, f, path):
+        """
+        Returns a format string of the expression that maps ``{}`` with the mapping of field ``f``,
+        and whether the mapping may raise :class:`.Field.Invalid`.
+        """
+        mapping = f.mapping
+        if type(mapping) is Mapping:
+            primitive = self.none_aware_function(mapping.loader)
+            if primitive:
+                return primitive + '({})', False
+        expr = self.mapping_constant(mapping, path + '.mapping')
+        if type(mapping).load is Mapping.load:
+            return self.constant(expr + '.loader', 'load') + '({})', True
+        return self.constant(expr + '.load', 'load') + '({})', True
+
+    def dumper(self, f, path):
+        if type(f).dump is not Field.dump:
+            return self.fallback(path + '.dump') + '({})'
+        mapping = f.mapping
+        if type(mapping) is Mapping:
+            primitive = self.none_aware_function(mapping.dumper)
+            if primitive:
+                return 'None if {0} is None else %s({0})' % primitive
+        expr = self.mapping_constant(mapping, path + '.mapping')
+        if type(mapping).dump is Mapping.dump:
+            return self.constant(expr + '.dumper', 'dump') + '({})'
+        return self.constant(expr + '.dump', 'dump') + '({})'
+
+    def default(self, f, path):
+        kind = f._default_kind
+        if kind == 'factory':
+            return (self.reference(f.default_factory) or self.fallback(path + '.default_factory')) + '()'
+        literal = self.literal(f._default)
+        if literal is not None:
+            # a literal creates a new value each time, like the copy of a mutable default
+            return literal
+        if kind == 'mutable':
+            return self.fallback(path) + '.default'
+        return self.fallback(path + '._default')
+
+    def schema_functions(self, schema, path, public=False):
+        """
+        Generates ``load`` and ``dump`` functions for ``schema``, returns their names.
+        """
+        if id(schema) in self.generated:
+            return self.generated[id(schema)]
+        if public:
+            names = 'load', 'dump'
+        else:
+            names = self.name('load'), self.name('dump')
+        self.generated[id(schema)] = names
+
+        load_lines = ['def {}(dct):'.format(names[0]), '    content = {}']
+        dump_lines = [
+            'def {}(value):'.format(names[1]),
+            '    if value is None:',
+            '        return value',
+            '    if not isinstance(value, dict):',
+            '        value = value._asdict()',
+            '    dumped = {}',
+        ]
+
+        for i, f in enumerate(schema.fields):
+            field_path = '{}.fields[{}]'.format(path, i)
+            load_lines.extend(self.field_load(f, field_path))
+            dump_lines.extend(self.field_dump(f, field_path))
+
+        load_lines.append('    return content')
+        dump_lines.append('    return dumped')
+        self.functions.append(load_lines)
+        self.functions.append(dump_lines)
+        return names
+
+    def field_load(self, f, path):
+        name = repr(f.name)
+        keys = f.source_names or [f.name]
+        lines = ['    # {}'.format(f.name)]
+
+        if len(keys) == 1:
+            lines.append('    if {!r} in dct:'.format(keys[0]))
+            lines.append('        raw = dct[{!r}]'.format(keys[0]))
+        else:
+            for j, key in enumerate(keys):
+                lines.append('    {} {!r} in dct:'.format('if' if j == 0 else 'elif', key))
+                lines.append('        raw = dct[{!r}]'.format(key))
+            lines.append('    else:')
+            lines.append('        raw = _nothing')
+            lines.append('    if raw is not _nothing:')
+
+        body = []
+        if f.nullable:
+            body.append('if raw is None:')
+            body.append('    value = None')
+        else:
+            body.append('if raw is None:')
+            body.append("    raise Invalid({}, reason='nullable')".format(name))
+        body.append('else:')
+        body.extend('    ' + line for line in self.field_value(f, path))
+        if f.forbidden:
+            body.append("raise Forbidden({}, reason='forbidden')".format(name))
+        else:
+            body.append('content[{}] = value'.format(name))
+        lines.extend('        ' + line for line in body)
+
+        if not f.forbidden:
+            if f._default_kind is not None:
+                lines.append('    else:')
+                lines.append('        content[{}] = {}'.format(name, self.default(f, path)))
+            elif f.required:
+                lines.append('    else:')
+                lines.append("        raise Missing({}, reason='required')".format(name))
+        return lines
+
+    def field_value(self, f, path):
+        """
+        Returns lines that set ``value`` to the loaded non-None ``raw`` value of field ``f``.
+        """
+        name = repr(f.name)
+        lines = []
+
+        if mutable_class_of(type(f)) in (NestedField, NestedListField):
+            load, dump = self.schema_functions(f.schema, path + '.schema')
+            if mutable_class_of(type(f)) is NestedField:
+                lines.append('if not isinstance(raw, dict):')
+                lines.append("    raise Invalid({}, reason='mapping')".format(name))
+                lines.append('try:')
+                lines.append('    value = {}(raw)'.format(load))
+                lines.append('except Error as exc:')
+                lines.append('    exc._prefixes = ({},) + exc._prefixes'.format(name))
+                lines.append('    raise')
+            else:
+                lines.append('if not isinstance(raw, (list, tuple)):')
+                lines.append("    raise Invalid({}, reason='mapping')".format(name))
+                lines.append('value = []')
+                lines.append('for index, item in enumerate(raw):')
+                lines.append('    if not isinstance(item, dict):')
+                lines.append("        raise Invalid('{{}}.{{}}'.format({}, index), reason='mapping')".format(name))
+                lines.append('    try:')
+                lines.append('        value.append({}(item))'.format(load))
+                lines.append('    except Error as exc:')
+                lines.append('        exc._prefixes = ({}, index) + exc._prefixes'.format(name))
+                lines.append('        raise')
+        elif type(f).load is not Field.load:
+            lines.append('value = {}(raw)'.format(self.fallback(path + '.load')))
+            return lines
+        else:
+            expr, may_raise_invalid = self.loader(f, path)
+            lines.append('try:')
+            lines.append('    value = {}'.format(expr.format('raw')))
+            if may_raise_invalid:
+                lines.append('except Invalid as invalid:')
+                lines.append('    raise Invalid(')
+                lines.append("        '{{}}.{{}}'.format({}, invalid.name), reason=invalid.reason, "
+                             "base_exc_info=sys.exc_info()".format(name))
+                lines.append('    )')
+            lines.append('except Exception:')
+            lines.append("    raise Invalid({}, reason='mapping', base_exc_info=sys.exc_info())".format(name))
+            self.imports.add('import sys')
+
+        lines.extend(self.field_checks(f, path))
+        return lines
+
+    def field_checks(self, f, path):
+        name = repr(f.name)
+        lines = []
+
+        def fail(reason):
+            return "    raise Invalid({}, reason='{}')".format(name, reason)
+
+        if f.max_len is not None:
+            lines.append('if len(value) > {!r}:'.format(f.max_len))
+            lines.append('    value = raw[:{!r}]'.format(f.max_len) if f.auto_trim else fail('max_len'))
+        if f.min_len is not None:
+            lines.append('if len(value) < {!r}:'.format(f.min_len))
+            lines.append(fail('min_len'))
+        for option, operator in (('max', '>'), ('min', '<')):
+            limit = getattr(f, option)
+            if limit is not None:
+                literal = self.literal(limit)
+                if literal is None:
+                    literal = self.fallback('{}.{}'.format(path, option))
+                lines.append('if value {} {}:'.format(operator, literal))
+                lines.append(fail(option))
+        if f.choices is not None:
+            for check, arg, reason in f._constraints:
+                if reason == 'choices':
+                    literal = self.literal(arg)
+                    if literal is not None:
+                        choices = self.constant(literal, 'choices')
+                    elif isinstance(arg, frozenset):
+                        choices = self.fallback('frozenset({}.choices)'.format(path))
+                    else:
+                        choices = self.fallback(path + '.choices')
+                    if isinstance(arg, frozenset):
+                        lines.append('if not _contains({}, value):'.format(choices))
+                    else:
+                        lines.append('if value not in {}:'.format(choices))
+                    lines.append(fail('choices'))
+        if f.regex is not None:
+            self.imports.add('import re')
+            regex = self.constant('re.compile({!r})'.format(f.regex), 'regex')
+            lines.append('if not isinstance(value, str) or {}.match(value) is None:'.format(regex))
+            lines.append(fail('regex'))
+        return lines
+
+    def field_dump(self, f, path):
+        name = repr(f.name)
+        dump_name = repr(f.source_names[0] if f.source_names else f.name)
+        lines = ['    if {} in value:'.format(name)]
+        if mutable_class_of(type(f)) in (NestedField, NestedListField):
+            load, dump = self.schema_functions(f.schema, path + '.schema')
+            lines.append('        v = value[{}]'.format(name))
+            if mutable_class_of(type(f)) is NestedField:
+                lines.append('        dumped[{}] = {}(v)'.format(dump_name, dump))
+            else:
+                lines.append('        dumped[{}] = None if v is None else [{}(item) for item in v]'.format(dump_name, dump))
+        else:
+            lines.append('        v = value[{}]'.format(name))
+            lines.append('        dumped[{}] = {}'.format(dump_name, self.dumper(f, path).format('v')))
+        return lines
+
+
+def generate(schema, source=None):
+    """
+    Returns the source code of the module generated for ``schema``. ``source`` is ``'module:attribute'``
+    of the schema -- needed only if some of it can't be written as code.
+    """
+    try:
+        return Generator(source).generate(schema)
+    except _CodeError as exc:
+        raise ValueError('Can not generate code for {!r} without the source of the schema'.format(exc.args[0]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m wr_schemas.codegen', description=__doc__.split('::')[0])
+    parser.add_argument('schema', help='module:attribute of the schema')
+    parser.add_argument('-o', '--output', help='file to write the module to, standard output by default')
+    args = parser.parse_args(argv)
+
+    module, _, attribute = args.schema.partition(':')
+    if not module or not attribute or ':' in attribute:
+        parser.error('schema must be given as module:attribute, not {!r}'.format(args.schema))
+    schema = getattr(importlib.import_module(module), attribute)
+    code = generate(schema, source=args.schema)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(code)
+    else:
+        sys.stdout.write(code)
+
+
+if __name__ == '__main__':
+    main()
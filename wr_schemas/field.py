@@ -1,8 +1,90 @@
-import copy
-import re
 import sys
 
-from .utils import _nothing, dump_for_mapping
+from .mappings import Mapping, none_aware_dumper_of, none_aware_loader_of, primitive_types
+from .utils import _nothing, derive, dump_for_mapping, mutable_class_of
+
+# types whose instances can be used as defaults without copying
+_immutable_types = frozenset([type(None), bool, int, float, complex, str, bytes, frozenset, range])
+
+# same for types of modules that aren't imported just to classify defaults, by (module, qualified name)
+_immutable_type_names = frozenset([
+    ('datetime', 'date'), ('datetime', 'datetime'), ('datetime', 'time'), ('datetime', 'timedelta'),
+    ('decimal', 'Decimal'),
+])
+
+# mutable defaults that are copied by calling their type
+_copied_by_type = frozenset([list, dict, set, bytearray])
+
+_str_dumper = none_aware_dumper_of(str)
+
+# mappings of types given as the mapping of a field, or inferred from the default, shared by all such fields
+_primitive_mappings = {}
+_inferred_mappings = {}
+
+
+def _is_immutable(value):
+    t = type(value)
+    if t is tuple:
+        return all(_is_immutable(item) for item in value)
+    return t in _immutable_types or (t.__module__, t.__qualname__) in _immutable_type_names
+
+
+def _copy_of(value):
+    if type(value) in _copied_by_type:
+        return type(value)(value)
+    import copy
+    return copy.copy(value)
+
+
+def _derivation_key(extras):
+    # with the types, so that arguments that are equal but of different types, like 1 and True, aren't mixed up
+    return tuple(sorted((name, type(value), value) for name, value in extras.items()))
+
+
+def _primitive_mapping_of(value_type):
+    mapping = _primitive_mappings.get(value_type)
+    if mapping is None:
+        mapping = _primitive_mappings[value_type] = Mapping.none_aware_for(value_type)
+    return mapping
+
+
+def _inferred_mapping_of(value_type):
+    mapping = _inferred_mappings.get(value_type)
+    if mapping is None:
+        mapping = _inferred_mappings[value_type] = Mapping(none_aware_loader_of(value_type), _str_dumper)
+    return mapping
+
+
+def _check_max_len(value, max_len):
+    return len(value) <= max_len
+
+
+def _check_min_len(value, min_len):
+    return len(value) >= min_len
+
+
+def _check_max(value, max):
+    return not value > max
+
+
+def _check_min(value, min):
+    return not value < min
+
+
+def _check_choices(value, choices):
+    return value in choices
+
+
+def _check_hashable_choices(value, choices):
+    try:
+        return value in choices
+    except TypeError:
+        # Unhashable values can't be among hashable choices
+        return False
+
+
+def _check_regex(value, pattern):
+    return isinstance(value, str) and pattern.match(value) is not None
 
 
 class Field:
@@ -17,14 +99,37 @@ class Field:
         """
         Base class for all Field-specific exceptions.
         """
+
+        #: Index of the offending row when raised by :meth:`.Schema.load_many` or :meth:`.Schema.iter_load`
+        row = None
+
+        # Names of the nested fields (and list indexes) that the error passed through, outermost first.
+        # Joined with the name only when the name is read.
+        _prefixes = ()
+
         def __init__(self, name, reason=None, base_exc_info=None):
             self.name = name
             self.reason = reason
             self.base_exc_info = base_exc_info
 
+        @property
+        def name(self):
+            if self._prefixes:
+                return '.'.join(map(str, self._prefixes + (self._name,)))
+            return self._name
+
+        @name.setter
+        def name(self, name):
+            self._name = name
+            self._prefixes = ()
+
         def __str__(self):
             return '{} (reason={})'.format(self.name, self.reason)
 
+        def __reduce__(self):
+            # base_exc_info holds a traceback which can't be pickled
+            return type(self), (self.name, self.reason), {'row': self.row}
+
     class Invalid(Error):
         """
         Raised when a field value does not meet the restrictions.
@@ -53,28 +158,38 @@ class Field:
         regex=None,
         source_names=None, source_name=None,
         nullable=True,
-        forbidden=None
+        forbidden=None,
+        default_factory=None
     ):
-        from .mappings import Mapping, none_aware_loader_of, none_aware_dumper_of, primitive_types
-
         self.name = name
 
+        if default is not self.nothing and default_factory is not None:
+            raise ValueError('Field {!r} can not have both default and default_factory'.format(name))
+
         self._default = default
-        if default is self.nothing and mapping is self.nothing:
-            mapping = none_aware_loader_of(str)
-        elif mapping is self.nothing:
-            if default is None:
-                mapping = none_aware_loader_of(str)
+        self.default_factory = default_factory
+
+        if mapping is self.nothing:
+            if default_factory is not None:
+                # inferred like it is from a default, which can only be done if the factory is a type
+                if not isinstance(default_factory, type):
+                    raise ValueError('Field {!r} with a default_factory that is not a type needs a mapping'.format(
+                        name
+                    ))
+                self.mapping = _inferred_mapping_of(default_factory)
+            elif default is self.nothing or default is None:
+                self.mapping = _inferred_mapping_of(str)
             else:
-                mapping = none_aware_loader_of(type(default))
-
-        if isinstance(mapping, Mapping):
+                self.mapping = _inferred_mapping_of(type(default))
+        elif isinstance(mapping, Mapping):
             self.mapping = mapping
+        elif mapping in primitive_types:
+            self.mapping = _primitive_mapping_of(mapping)
+        elif hasattr(type(mapping), 'try_load'):
+            # Nested schema
+            self.mapping = Mapping(mapping, mapping.dump)
         else:
-            if mapping in primitive_types:
-                self.mapping = Mapping(none_aware_loader_of(mapping), none_aware_dumper_of(mapping))
-            else:
-                self.mapping = Mapping(mapping, none_aware_dumper_of(str))
+            self.mapping = Mapping(mapping, _str_dumper)
 
         self.max_len = max_len
         self.min_len = min_len
@@ -88,6 +203,8 @@ class Field:
         self.nullable = nullable or (self._default is None)
         self.forbidden = forbidden
 
+        self.compile()
+
     def __str__(self):
         return self.name
 
@@ -97,7 +214,9 @@ class Field:
     def clone(self, reverse=False, **overrides):
         overrides.setdefault('name', self.name)
         overrides.setdefault('mapping', self.mapping)
-        overrides.setdefault('default', self.default)
+        if 'default' not in overrides and 'default_factory' not in overrides:
+            overrides['default'] = self._default
+            overrides['default_factory'] = self.default_factory
         overrides.setdefault('max_len', self.max_len)
         overrides.setdefault('min_len', self.min_len)
         overrides.setdefault('auto_trim', self.auto_trim)
@@ -115,21 +234,100 @@ class Field:
             overrides['name'] = self.source_names[0] if self.source_names else self.name
             overrides['source_name'] = self.name
 
-        return self.__class__(**overrides)
+        return mutable_class_of(type(self))(**overrides)
+
+    def compile(self):
+        """
+        Builds the constraint plan used by :meth:`.load` -- only the checks that apply to this field,
+        in the order they are checked, with the regex pre-compiled and hashable choices in a frozenset.
+        Also classifies the default -- immutable defaults are returned by :attr:`.default` as they are,
+        mutable ones are copied -- and detects a nested schema so that :meth:`.try_load` can report all of its errors.
+
+        Called on construction (and therefore on :meth:`.clone`). Call it again if you modify
+        the constraint attributes of an existing field.
+        """
+        self.__dict__.pop('_derived', None)
+
+        constraints = []
+        if self.max_len is not None:
+            constraints.append((_check_max_len, self.max_len, 'max_len'))
+        if self.min_len is not None:
+            constraints.append((_check_min_len, self.min_len, 'min_len'))
+        if self.max is not None:
+            constraints.append((_check_max, self.max, 'max'))
+        if self.min is not None:
+            constraints.append((_check_min, self.min, 'min'))
+        if self.choices is not None:
+            choices = self.choices
+            if isinstance(choices, (list, tuple, set)):
+                try:
+                    choices = frozenset(choices)
+                except TypeError:
+                    pass
+            if isinstance(choices, frozenset):
+                constraints.append((_check_hashable_choices, choices, 'choices'))
+            else:
+                constraints.append((_check_choices, choices, 'choices'))
+        if self.regex is not None:
+            import re
+            constraints.append((_check_regex, re.compile(self.regex), 'regex'))
+        self._constraints = tuple(constraints)
+
+        if self.default_factory is not None:
+            self._default_kind = 'factory'
+        elif self._default is _nothing:
+            self._default_kind = None
+        elif _is_immutable(self._default):
+            self._default_kind = 'immutable'
+        else:
+            self._default_kind = 'mutable'
+
+        # Nested schema (anything that supports try_load) used as the loader of the mapping
+        loader = getattr(self.mapping, 'loader', self.mapping)
+        self._nested = loader if hasattr(type(loader), 'try_load') else None
+
+        return self
 
     def map_as(self, name=None, **extras):
+        """
+        Returns a clone of the field named ``name`` that is loaded from this field's name.
+        The same clone is returned for the same arguments until the field is compiled again,
+        so it can't be changed -- :meth:`.clone` it to change it.
+        """
         name = name or self.name
-        return self.clone(name=name, source_name=self.name, **extras)
+        return derive(
+            self, ('map_as', name, _derivation_key(extras)),
+            lambda: self.clone(name=name, source_name=self.name, **extras),
+        )
 
     def reverse(self, **extras):
-        return self.clone(reverse=True, **extras)
+        """
+        Returns the reversed clone of the field, the same one for the same arguments
+        until the field is compiled again, so it can't be changed.
+        """
+        return derive(
+            self, ('reverse', _derivation_key(extras)),
+            lambda: self.clone(reverse=True, **extras),
+        )
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_derived', None)
+        return state
 
     @property
     def default(self):
-        if self._default is _nothing:
-            return self._default
+        """
+        Default value -- a copy of ``default``, a new value from ``default_factory``,
+        or :attr:`.nothing` if the field has no default.
+        """
+        kind = self._default_kind
+        if kind == 'mutable':
+            return _copy_of(self._default)
+        elif kind == 'factory':
+            return self.default_factory()
         else:
-            return copy.copy(self._default)
+            return self._default
 
     def has_value_in(self, container):
         if self.source_names:
@@ -169,36 +367,56 @@ class Field:
         except Exception:
             raise self.Invalid(self.name, reason='mapping', base_exc_info=sys.exc_info())
 
-        if self.max_len is not None:
-            if len(value) > self.max_len:
-                if self.auto_trim:
-                    value = raw_value[:self.max_len]
-                else:
-                    raise self.Invalid(self.name, reason='max_len')
-
-        if self.min_len is not None:
-            if len(value) < self.min_len:
-                raise self.Invalid(self.name, reason='min_len')
+        value, reason = self._check(raw_value, value)
+        if reason is not None:
+            raise self.Invalid(self.name, reason=reason)
 
-        if self.max is not None:
-            if value > self.max:
-                raise self.Invalid(self.name, reason='max')
+        return value
 
-        if self.min is not None:
-            if value < self.min:
-                raise self.Invalid(self.name, reason='min')
+    def try_load(self, raw_value):
+        """
+        Same as :meth:`.load`, but instead of raising returns ``(value, errors)`` where ``errors``
+        is ``None`` or a list of ``(name, reason)`` pairs. No exceptions are created for invalid values,
+        and all errors of a nested schema are reported, not just the first one.
+        """
+        if raw_value is None:
+            if self.nullable:
+                return raw_value, None
+            else:
+                return None, [(self.name, 'nullable')]
+
+        if self._nested is not None:
+            try:
+                value, nested_errors = self._nested.try_load(raw_value)
+            except Exception:
+                return None, [(self.name, 'mapping')]
+            if nested_errors:
+                return None, [('{}.{}'.format(self.name, name), reason) for name, reason in nested_errors]
+        else:
+            try:
+                value = self.mapping(raw_value)
+            except Field.Invalid as invalid:
+                return None, [('{}.{}'.format(self.name, invalid.name), invalid.reason)]
+            except Exception:
+                return None, [(self.name, 'mapping')]
 
-        if self.choices is not None:
-            if value not in self.choices:
-                raise self.Invalid(self.name, reason='choices')
+        value, reason = self._check(raw_value, value)
+        if reason is not None:
+            return None, [(self.name, reason)]
 
-        if self.regex is not None:
-            if not isinstance(value, str):
-                raise self.Invalid(self.name, reason='regex')
-            if not re.match(self.regex, value):
-                raise self.Invalid(self.name, reason='regex')
+        return value, None
 
-        return value
+    def _check(self, raw_value, value):
+        """
+        Runs the constraint plan, returns ``(value, reason)`` where ``reason`` is ``None`` if the value is valid.
+        """
+        for check, arg, reason in self._constraints:
+            if not check(value, arg):
+                if check is _check_max_len and self.auto_trim:
+                    value = raw_value[:arg]
+                else:
+                    return value, reason
+        return value, None
 
     def dump(self, value):
         return dump_for_mapping(self.mapping, value)
@@ -1,38 +1,33 @@
-from .field import Field
+from . import jsonio
 from .schema import Schema
+from .utils import merge_sources
 
 
 class FlaskRequestSchemaMixin:
     def from_request(self, **extras):
         """
-        Reads values for fields from Flask request object. Values passed via `extras` take precedence.
+        Reads values for fields from Flask request object. Values passed via `extras` take precedence,
+        followed by query string arguments, JSON body and form data.
+
+        All sources are merged once, so each field is looked up once. The JSON body is decoded
+        with ``flask.json.loads`` unless another decoder is set with :func:`.jsonio.set_json_decoder`.
         """
         assert isinstance(self, Schema)
 
         from flask import json, request
 
         if request.content_type == 'application/json' and request.data:
-            request_body = json.loads(request.data)
+            request_body = (jsonio.json_loads or json.loads)(request.data)
+            if not isinstance(request_body, dict):
+                request_body = None
         else:
-            request_body = {}
-
-        content = {}
-
-        for f in self.fields:  # type: Field
-            if f.has_value_in(extras):
-                f.set_value_in(content, f.load(f.get_value_in(extras)))
-            elif f.has_value_in(request.args):
-                f.set_value_in(content, f.load(f.get_value_in(request.args)))
-            elif f.has_value_in(request_body):
-                f.set_value_in(content, f.load(f.get_value_in(request_body)))
-            elif f.has_value_in(request.form):
-                f.set_value_in(content, f.load(f.get_value_in(request.form)))
-            elif f.forbidden:
-                continue
-            elif f.default is not Field.nothing:
-                f.set_value_in(content, f.default)
-            elif f.required:
-                raise f.Missing(f.name, reason='required')
+            request_body = None
+
+        if self._compiled_fields != self.fields:
+            self.compile()
+
+        merged = merge_sources(extras, request.args, request_body, request.form)
+        content = self._load_resolved(self._resolve_merged(merged))
 
         if self.instance_factory is None:
             return content
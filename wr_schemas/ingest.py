@@ -0,0 +1,245 @@
+"""
+Loading JSON lines and CSV files with a schema::
+
+    from wr_schemas.ingest import load_file
+
+    result = load_file(schema, 'users.jsonl', valid='valid.jsonl', rejected='rejected.jsonl', workers=4)
+
+The file is memory-mapped and split into chunks at line ends, and each chunk is loaded
+with :meth:`.Schema.load_many`, optionally in worker processes that map the file themselves.
+
+CSV files must have a header line; the headers are the source names of the fields, resolved
+once per chunk. Quoted CSV values with line breaks are not supported.
+"""
+import collections
+import csv
+import itertools
+import json
+import mmap
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from .batch import load_many
+from .field import Field
+from .jsonio import decode_payload
+from .parallel import new_call_key, worker_state
+
+IngestResult = collections.namedtuple('IngestResult', ['valid', 'rejected'])
+
+
+def _map_file(f):
+    if os.fstat(f.fileno()).st_size == 0:
+        return b''
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _chunks(data, start, chunk_size):
+    """
+    Yields ``(start, end)`` of chunks of about ``chunk_size`` bytes that end with a line end.
+    """
+    size = len(data)
+    while start < size:
+        end = data.find(b'\n', start + chunk_size)
+        end = size if end == -1 else end + 1
+        yield start, end
+        start = end
+
+
+def _lines_of(chunk):
+    lines = chunk.split(b'\n')
+    if lines and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _load_lines(schema, lines, format, header, encoding):
+    """
+    Returns ``(contents, rejected)`` -- loaded contents of valid lines and ``(line index, field name, reason)``
+    of rejected lines, indexes relative to the first of ``lines``.
+    """
+    rejected = []
+    positions = []
+
+    if format == 'jsonl':
+        rows = []
+        for i, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                rows.append(decode_payload(line))
+            except Field.Invalid as exc:
+                rejected.append((i, exc.name, exc.reason))
+                continue
+            positions.append(i)
+        data = rows
+
+    else:
+        cell_rows = []
+        for i, cells in enumerate(csv.reader(line.decode(encoding) for line in lines)):
+            if not cells:
+                continue
+            if len(cells) != len(header):
+                rejected.append((i, None, 'csv'))
+                continue
+            cell_rows.append(cells)
+            positions.append(i)
+        columns = zip(*cell_rows) if cell_rows else [()] * len(header)
+        data = dict(zip(header, columns))
+
+    errors = []
+    contents = load_many(schema, data, errors=errors)
+    rejected.extend((positions[row], name, reason) for row, name, reason in errors)
+    rejected.sort(key=lambda entry: entry[0])
+    return contents, rejected
+
+
+def _setup_worker(schema, path, format, header, encoding):
+    # Instances are created in the parent process, instance factories may not be picklable
+    schema.instance_factory = None
+    with open(path, 'rb') as f:
+        return schema, _map_file(f), format, header, encoding
+
+
+def _load_chunk(key, payload, start, end):
+    schema, data, format, header, encoding = worker_state(key, payload, _setup_worker)
+    lines = _lines_of(data[start:end])
+    contents, rejected = _load_lines(schema, lines, format, header, encoding)
+    return contents, rejected, len(lines)
+
+
+def _output(target, write_line):
+    """
+    Returns ``(write, close)`` for an output that is a callable, a path, or ``None``.
+    """
+    if target is None:
+        return None, None
+    if callable(target):
+        return target, None
+    f = open(target, 'wb')
+
+    def write(*args):
+        f.write(write_line(*args))
+        f.write(b'\n')
+
+    return write, f.close
+
+
+def load_file(
+    schema, path, format='jsonl', *,
+    valid=None, rejected=None,
+    workers=None, chunk_size=1 << 20, encoding='utf-8'
+):
+    """
+    Loads every line of the file at ``path`` (``format`` is ``'jsonl'`` or ``'csv'``) with ``schema``.
+
+    ``valid`` is called with every loaded instance, or, if it is a path, the instances
+    are written there as JSON lines dumped with :meth:`.Schema.dump_json`.
+
+    ``rejected`` is called with ``(line index, field name, reason, line)`` of every line that failed to load,
+    or, if it is a path, these are written there as JSON lines with keys ``line``, ``field``, ``reason``
+    and ``raw``. Lines that aren't JSON objects or have the wrong number of CSV values are rejected with
+    reason ``'json'`` or ``'csv'`` and no field name.
+
+    With ``workers`` greater than 1, chunks of ``chunk_size`` bytes are loaded in that many processes.
+    The schema must be picklable. Outputs are written in the order of the file either way.
+
+    Returns ``IngestResult(valid, rejected)`` with the number of valid and rejected lines.
+    """
+    if format not in ('jsonl', 'csv'):
+        raise ValueError('format must be "jsonl" or "csv", not {!r}'.format(format))
+
+    if schema._compiled_fields != schema.fields:
+        schema.compile()
+
+    write_valid, close_valid = _output(
+        valid, lambda instance: schema.dump_json(instance),
+    )
+    write_rejected, close_rejected = _output(
+        rejected, lambda line, name, reason, raw: json.dumps({
+            'line': line, 'field': name, 'reason': reason, 'raw': raw.decode(encoding, 'replace').rstrip('\r'),
+        }).encode(),
+    )
+
+    num_valid = 0
+    num_rejected = 0
+
+    with open(path, 'rb') as f:
+        data = _map_file(f)
+        try:
+            header = None
+            start = 0
+            first_line = 0
+            if format == 'csv':
+                end = data.find(b'\n')
+                end = len(data) if end == -1 else end + 1
+                header = next(csv.reader([bytes(data[:end]).decode(encoding)]), [])
+                start = end
+                first_line = 1
+
+            if workers and workers > 1:
+                results = _load_in_workers(schema, path, format, header, encoding, data, start, chunk_size, workers)
+            else:
+                results = (
+                    _load_lines(schema, lines, format, header, encoding) + (len(lines),)
+                    for lines in (_lines_of(data[s:e]) for s, e in _chunks(data, start, chunk_size))
+                )
+
+            find_line = _line_finder(data)
+            for instances, chunk_rejected, num_lines in results:
+                num_valid += len(instances)
+                num_rejected += len(chunk_rejected)
+                if write_valid is not None:
+                    for instance in instances:
+                        write_valid(instance)
+                if write_rejected is not None:
+                    for i, name, reason in chunk_rejected:
+                        write_rejected(first_line + i, name, reason, find_line(first_line + i))
+                first_line += num_lines
+        finally:
+            if close_valid is not None:
+                close_valid()
+            if close_rejected is not None:
+                close_rejected()
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    return IngestResult(num_valid, num_rejected)
+
+
+def _line_finder(data):
+    """
+    Returns a function that returns line ``n`` of ``data``, for ``n`` in increasing order.
+    """
+    state = {'line': 0, 'start': 0}
+
+    def find(n):
+        while state['line'] < n:
+            state['start'] = data.find(b'\n', state['start']) + 1
+            state['line'] += 1
+        end = data.find(b'\n', state['start'])
+        return bytes(data[state['start']:len(data) if end == -1 else end])
+
+    return find
+
+
+def _load_in_workers(schema, path, format, header, encoding, data, start, chunk_size, workers):
+    chunks = _chunks(data, start, chunk_size)
+    pending = collections.deque()
+    key = new_call_key()
+    payload = pickle.dumps((schema, path, format, header, encoding))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            while True:
+                for chunk_start, chunk_end in itertools.islice(chunks, 2 * workers - len(pending)):
+                    pending.append(executor.submit(_load_chunk, key, payload, chunk_start, chunk_end))
+                if not pending:
+                    return
+                contents, rejected, num_lines = pending.popleft().result()
+                if schema.instance_factory is not None:
+                    contents = [schema.instance_factory(**content) for content in contents]
+                yield contents, rejected, num_lines
+        finally:
+            for future in pending:
+                future.cancel()
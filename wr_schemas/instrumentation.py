@@ -0,0 +1,283 @@
+"""
+Opt-in instrumentation of schemas::
+
+    collector = Collector()
+    schema.instrument(collector)
+    ...
+    print(collector.prometheus())
+
+Instrumenting a schema replaces its load, try_load and dump methods and the per-field functions
+in its load and dump plans with timed versions. A schema that isn't instrumented runs no extra code.
+
+Metrics reported to the sink (tags are ``schema`` and, for field metrics, ``field``):
+
+ * ``schema_load_seconds``, ``schema_dump_seconds`` -- timings
+ * ``field_load_seconds``, ``field_dump_seconds`` -- timings
+ * ``payload_keys`` -- histogram of the number of keys in loaded payloads
+ * ``invalid_values_total`` -- counter, tagged also with ``reason``
+ * ``mapping_errors_total`` -- counter of exceptions raised by mappings, tagged also with ``exception``
+
+:meth:`.Schema.try_load` doesn't keep the exceptions of invalid values, so if it reports mapping errors,
+the values are loaded again to tell which exceptions they raise.
+
+A sink is an object with methods ``timing(metric, seconds, tags)``, ``increment(metric, tags)`` and
+``histogram(metric, value, tags)``, where ``tags`` is a tuple of ``(name, value)`` pairs,
+or a function ``callback(kind, metric, value, tags)``.
+"""
+import bisect
+import time
+
+from .field import Field
+
+perf_counter = time.perf_counter
+
+
+class CallbackSink:
+    """
+    Passes every measurement to ``callback(kind, metric, value, tags)`` where ``kind`` is
+    ``'timing'``, ``'increment'`` or ``'histogram'``.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def timing(self, metric, seconds, tags):
+        self.callback('timing', metric, seconds, tags)
+
+    def increment(self, metric, tags):
+        self.callback('increment', metric, 1, tags)
+
+    def histogram(self, metric, value, tags):
+        self.callback('histogram', metric, value, tags)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """
+        Upper bound of the bucket that the ``q`` quantile falls in, ``None`` if it's above the last bucket.
+        """
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+
+class Collector:
+    """
+    Sink that aggregates measurements in memory, like a local statsd.
+    Timings and histograms are kept as bucket counts.
+    """
+
+    time_buckets = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2, 0.1, 1.0)
+    size_buckets = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+    prefix = 'wr_schemas_'
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+    def reset(self):
+        self.counters.clear()
+        self.histograms.clear()
+
+    def timing(self, metric, seconds, tags):
+        key = (metric, tags)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.time_buckets)
+        histogram.observe(seconds)
+
+    def increment(self, metric, tags):
+        key = (metric, tags)
+        self.counters[key] = self.counters.get(key, 0) + 1
+
+    def histogram(self, metric, value, tags):
+        key = (metric, tags)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.size_buckets)
+        histogram.observe(value)
+
+    def counter(self, metric, **tags):
+        """
+        Sum of the counters of ``metric`` that have all of ``tags``.
+        """
+        return sum(
+            value for (name, metric_tags), value in self.counters.items()
+            if name == metric and _has_tags(metric_tags, tags)
+        )
+
+    def prometheus(self):
+        """
+        Returns the collected metrics in the Prometheus text exposition format.
+        """
+        lines = []
+
+        for metric in sorted({name for name, tags in self.counters}):
+            lines.append('# TYPE {}{} counter'.format(self.prefix, metric))
+            for (name, tags), value in sorted(self.counters.items()):
+                if name == metric:
+                    lines.append('{}{}{} {}'.format(self.prefix, metric, _labels(tags), value))
+
+        for metric in sorted({name for name, tags in self.histograms}):
+            lines.append('# TYPE {}{} histogram'.format(self.prefix, metric))
+            for (name, tags), histogram in sorted(self.histograms.items(), key=lambda item: item[0]):
+                if name != metric:
+                    continue
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ('+Inf',), histogram.counts):
+                    cumulative += count
+                    lines.append('{}{}_bucket{} {}'.format(
+                        self.prefix, metric, _labels(tags + (('le', bound),)), cumulative
+                    ))
+                lines.append('{}{}_sum{} {}'.format(self.prefix, metric, _labels(tags), histogram.sum))
+                lines.append('{}{}_count{} {}'.format(self.prefix, metric, _labels(tags), histogram.count))
+
+        return '\n'.join(lines) + '\n'
+
+
+def _has_tags(metric_tags, tags):
+    metric_tags = dict(metric_tags)
+    return all(metric_tags.get(name) == value for name, value in tags.items())
+
+
+def _labels(tags):
+    if not tags:
+        return ''
+    return '{' + ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in tags
+    ) + '}'
+
+
+class Instrumentation:
+    """
+    Instruments one schema, see :meth:`.Schema.instrument`.
+    """
+
+    #: Schema methods that are replaced on the instrumented schema instance
+    methods = ('load', 'try_load', 'dump')
+
+    def __init__(self, schema, sink, name):
+        if not hasattr(sink, 'timing'):
+            sink = CallbackSink(sink)
+        self.schema = schema
+        self.sink = sink
+        self.name = name
+        self.tags = (('schema', name),)
+
+    def install(self):
+        for method in self.methods:
+            # through the instance dict, derived schemas refuse to set public attributes
+            self.schema.__dict__[method] = getattr(self, method)
+
+    def uninstall(self):
+        for method in self.methods:
+            self.schema.__dict__.pop(method, None)
+
+    def instrument_plans(self, load_plan, dump_plan):
+        """
+        Returns the load and dump plans of the schema with timed field load and dump functions.
+        """
+        return (
+            tuple(
+                (f, name, keys, self._timed(load, 'field_load_seconds', name), forbidden, required)
+                for f, name, keys, load, forbidden, required in load_plan
+            ),
+            tuple(
+                # values that would be passed through are timed too
+                (name, dump_name, self._timed(dumper, 'field_dump_seconds', name), ())
+                for name, dump_name, dumper, passthrough in dump_plan
+            ),
+        )
+
+    def _timed(self, function, metric, field_name):
+        timing = self.sink.timing
+        tags = self.tags + (('field', field_name),)
+
+        def timed(value):
+            start = perf_counter()
+            try:
+                return function(value)
+            finally:
+                timing(metric, perf_counter() - start, tags)
+
+        return timed
+
+    def _record_error(self, name, reason, base_exc_info=None):
+        self.sink.increment('invalid_values_total', self.tags + (('field', name), ('reason', reason)))
+        if reason == 'mapping' and base_exc_info:
+            self.sink.increment(
+                'mapping_errors_total',
+                self.tags + (('field', name), ('exception', base_exc_info[0].__name__)),
+            )
+
+    def load(self, dct=None, *, collect_errors=False, **extras):
+        if collect_errors:
+            return self.try_load(dct, **extras)
+
+        schema = self.schema
+        self.sink.histogram('payload_keys', len(dct) if dct else 0, self.tags)
+        start = perf_counter()
+        try:
+            return type(schema).load(schema, dct, **extras)
+        except Field.Error as exc:
+            self._record_error(exc.name, exc.reason, exc.base_exc_info)
+            raise
+        finally:
+            self.sink.timing('schema_load_seconds', perf_counter() - start, self.tags)
+
+    def try_load(self, dct=None, **extras):
+        schema = self.schema
+        self.sink.histogram('payload_keys', len(dct) if dct else 0, self.tags)
+        start = perf_counter()
+        try:
+            instance, errors = type(schema).try_load(schema, dct, **extras)
+        finally:
+            self.sink.timing('schema_load_seconds', perf_counter() - start, self.tags)
+        if errors:
+            exc_infos = {}
+            if any(reason == 'mapping' for name, reason in errors):
+                exc_infos = self._mapping_exc_infos(dct, extras)
+            for name, reason in errors:
+                self._record_error(name, reason, exc_infos.get(name))
+        return instance, errors
+
+    def _mapping_exc_infos(self, dct, extras):
+        """
+        Returns exception info of mapping errors by field path, which try_load doesn't keep,
+        by loading the values of the payload again one field at a time as load does.
+        """
+        exc_infos = {}
+        for (f, name, keys, load, forbidden, required), raw_value in self.schema._resolve(dct, extras):
+            if raw_value is Field.nothing:
+                continue
+            try:
+                f.load(raw_value)
+            except Field.Error as exc:
+                if exc.reason == 'mapping' and exc.base_exc_info:
+                    exc_infos[exc.name] = exc.base_exc_info
+        return exc_infos
+
+    def dump(self, value):
+        schema = self.schema
+        start = perf_counter()
+        try:
+            return type(schema).dump(schema, value)
+        finally:
+            self.sink.timing('schema_dump_seconds', perf_counter() - start, self.tags)
@@ -0,0 +1,157 @@
+"""
+Loading schema instances from JSON and dumping them straight to JSON bytes.
+
+JSON is decoded with :func:`json.loads` unless a faster decoder is chosen with :func:`set_json_decoder`.
+"""
+import json
+import sys
+from json.encoder import JSONEncoder, encode_basestring_ascii
+
+from .field import Field
+from .utils import _nothing
+
+# Decoder of JSON payloads, request bodies and lines, None for the default
+json_loads = None
+
+try:
+    from orjson import dumps as orjson_dumps
+except ImportError:  # pragma: no cover
+    orjson_dumps = None
+
+# Same output as json.dumps with compact separators
+_encode = JSONEncoder(separators=(',', ':')).encode
+
+_encoders = {
+    str: encode_basestring_ascii,
+    int: int.__repr__,
+    bool: lambda value: 'true' if value else 'false',
+    type(None): lambda value: 'null',
+}
+
+
+def json_keys(schema):
+    """
+    Returns the JSON-escaped dump names of the fields in the dump plan of ``schema``, followed by ``:``.
+    Escaped on first use after each compilation of the schema.
+    """
+    if schema._json_keys is None:
+        # set in the instance dict directly, derived schemas are frozen
+        schema.__dict__['_json_keys'] = tuple(
+            encode_basestring_ascii(dump_name) + ':' for name, dump_name, dumper, passthrough in schema._dump_plan
+        )
+    return schema._json_keys
+
+
+def _dump_json_str(schema, value):
+    if value is None:
+        return 'null'
+
+    if schema._compiled_fields != schema.fields:
+        schema.compile()
+
+    encoders = _encoders
+    keys = json_keys(schema)
+    parts = []
+
+    if isinstance(value, dict):
+        for (name, dump_name, dumper, passthrough), key in zip(schema._dump_plan, keys):
+            if name in value:
+                v = value[name]
+                if type(v) not in passthrough:
+                    v = dumper(v)
+                parts.append(key + encoders.get(type(v), _encode)(v))
+    else:
+        for (name, dump_name, dumper, passthrough), key in zip(schema._dump_plan, keys):
+            v = getattr(value, name, _nothing)
+            if v is not _nothing:
+                if type(v) not in passthrough:
+                    v = dumper(v)
+                parts.append(key + encoders.get(type(v), _encode)(v))
+
+    return '{' + ','.join(parts) + '}'
+
+
+def dump_json(schema, value):
+    """
+    Implementation of :meth:`.Schema.dump_json`.
+    """
+    if orjson_dumps is not None:
+        try:
+            return orjson_dumps(schema.dump(value))
+        except TypeError:
+            # orjson doesn't encode integers over 64 bits or dicts with keys other than str
+            pass
+    return _dump_json_str(schema, value).encode()
+
+
+def dump_json_many(schema, values):
+    """
+    Implementation of :meth:`.Schema.dump_json_many`.
+    """
+    dumped = schema.dump_many(values)
+    if orjson_dumps is not None:
+        try:
+            return orjson_dumps(dumped)
+        except TypeError:
+            pass
+    # For many instances the C encoder of json on the dumped list beats encoding values one by one
+    return _encode(dumped).encode()
+
+
+def set_json_decoder(decoder):
+    """
+    Sets the function that decodes JSON in :meth:`.Schema.load_json`, :meth:`.Schema.iter_load_json`,
+    :func:`.ingest.load_file` and the ``from_request`` of the request mixins: ``'orjson'``, ``'ujson'``,
+    any function like :func:`json.loads`, or ``None`` for the default -- :func:`json.loads`, or
+    ``flask.json.loads`` for Flask requests.
+
+    The faster decoders don't decode everything the same way: orjson decodes integers over 64 bits
+    to floats and rejects ``NaN`` and ``Infinity``, ujson rejects integers over 64 bits.
+    """
+    global json_loads
+    if decoder == 'orjson':
+        from orjson import loads as decoder
+    elif decoder == 'ujson':
+        from ujson import loads as decoder
+    json_loads = decoder
+
+
+def decode_payload(data):
+    """
+    Decodes a JSON object from ``bytes`` or ``str``. Raises :class:`.Field.Invalid` with reason ``'json'``
+    and no name if ``data`` isn't valid JSON or isn't an object.
+    """
+    try:
+        payload = (json_loads or json.loads)(data)
+    except ValueError:
+        raise Field.Invalid(None, reason='json', base_exc_info=sys.exc_info())
+    if not isinstance(payload, dict):
+        raise Field.Invalid(None, reason='json')
+    return payload
+
+
+def load_json(schema, data, extras):
+    """
+    Implementation of :meth:`.Schema.load_json`.
+    """
+    return schema.load(decode_payload(data), **extras)
+
+
+def iter_load_json(schema, lines, errors='raise'):
+    """
+    Implementation of :meth:`.Schema.iter_load_json`.
+    """
+    load = schema.load
+    for i, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            instance = load(decode_payload(line))
+        except Field.Error as exc:
+            if errors == 'raise':
+                exc.row = i
+                raise
+            elif errors != 'skip':
+                errors.append((i, exc.name, exc.reason))
+            continue
+        yield instance
@@ -1,7 +1,3 @@
-import datetime as dt
-
-from .utils import dump_for_mapping
-
 # primitive types are those that by default are serialized as they are
 primitive_types = (int, str, bool, float)
 
@@ -12,6 +8,9 @@ def none_aware_loader_of(value_type):
             return raw_value
         return value_type(raw_value)
 
+    # lets Mapping pickle it
+    loader.none_aware_type = value_type
+
     return loader
 
 
@@ -21,20 +20,112 @@ def none_aware_dumper_of(value_type):
             return value
         return value_type(value)
 
+    dumper.none_aware_type = value_type
+
     return dumper
 
 
+def _chain_of(functions):
+    """
+    Composes ``functions`` into one function that calls them in order.
+    Adjacent none-aware functions share one ``None`` check and the type they wrap is called directly.
+    """
+    segments = []
+    for function in functions:
+        value_type = getattr(function, 'none_aware_type', None)
+        none_aware = value_type is not None
+        if none_aware:
+            function = value_type
+        if segments and segments[-1][1] == none_aware:
+            segments[-1][0].append(function)
+        else:
+            segments.append(([function], none_aware))
+    segments = tuple((tuple(functions), none_aware) for functions, none_aware in segments)
+
+    if len(segments) == 1:
+        functions, none_aware = segments[0]
+
+        if none_aware:
+            def chained(value):
+                if value is None:
+                    return value
+                for function in functions:
+                    value = function(value)
+                return value
+        else:
+            def chained(value):
+                for function in functions:
+                    value = function(value)
+                return value
+
+        return chained
+
+    def chained(value):
+        for functions, none_aware in segments:
+            if none_aware and value is None:
+                continue
+            for function in functions:
+                value = function(value)
+        return value
+
+    return chained
+
+
+class _Rebuild:
+    """
+    Pickled as a call to ``factory(*args)``, so that unpickling builds again the closure that the factory returns.
+    """
+
+    def __init__(self, factory, *args):
+        self.factory = factory
+        self.args = args
+
+    def __reduce__(self):
+        return self.factory, self.args
+
+
+def _from_recipe(factory, args, kwargs):
+    return factory(*args, **kwargs)
+
+
 class Mapping:
-    def __init__(self, loader: callable, dumper: callable=str, **extras):
+    def __init__(self, loader: callable, dumper: callable = str, *, batch_loader: callable = None, **extras):
         self.loader = loader
         self.dumper = dumper
+        self.batch_loader = batch_loader
         self.extras = extras
 
+        # (factory, args, kwargs) that built this mapping, for mappings whose loaders are closures
+        # that can't be pickled -- they are re-built on unpickling instead.
+        self._recipe = None
+
     def reverse(self):
-        return self.__class__(self.dumper, self.loader, **self.extras)
+        if 'stages' in self.__dict__:
+            return Mapping.chain(*[stage.reverse() for stage in reversed(self.stages)])
+        reversed_mapping = self.__class__(self.dumper, self.loader, **self.extras)
+        if self._recipe is not None:
+            reversed_mapping._recipe = (Mapping.reverse, (self,), {})
+        return reversed_mapping
 
     def __getattr__(self, name):
-        return self.extras[name]
+        if name.startswith('__'):
+            raise AttributeError(name)
+        try:
+            return self.__dict__['extras'][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __reduce_ex__(self, protocol):
+        import copyreg
+
+        if self._recipe is not None:
+            return _from_recipe, self._recipe
+        state = self.__dict__.copy()
+        for name in ('loader', 'dumper'):
+            value_type = getattr(state[name], 'none_aware_type', None)
+            if value_type is not None:
+                state[name] = _Rebuild(none_aware_loader_of, value_type)
+        return copyreg.__newobj__, (type(self),), state
 
     def __call__(self, raw_value):
         return self.load(raw_value)
@@ -42,28 +133,163 @@ class Mapping:
     def load(self, raw_value):
         return self.loader(raw_value)
 
+    def load_many(self, raw_values):
+        """
+        Loads a list of values, same as ``[mapping.load(v) for v in raw_values]``,
+        but using the ``batch_loader`` if the mapping has one.
+        """
+        if self.batch_loader is not None:
+            return self.batch_loader(raw_values)
+        load = self.loader if type(self).load is Mapping.load else self.load
+        return [load(raw_value) for raw_value in raw_values]
+
     def dump(self, value):
         return self.dumper(value)
 
     def append(self, mapping: 'Mapping'):
-        def loader(raw_value):
-            return mapping.load(self.load(raw_value))
+        return Mapping.chain(self, mapping)
 
-        def dumper(value):
-            return self.dump(mapping.dump(value))
-
-        return Mapping(loader, dumper)
+    @classmethod
+    def chain(cls, *mappings):
+        """
+        Returns a mapping that loads with each of ``mappings`` in order and dumps in reverse order.
+        Chained mappings are flattened into one list of :attr:`stages`, which is run in a single loop.
+        """
+        stages = []
+        for mapping in mappings:
+            stages.extend(mapping.__dict__.get('stages') or [mapping])
+
+        loaders = [
+            (stage.loader if type(stage).load is Mapping.load else stage.load) for stage in stages
+        ]
+        dumpers = [
+            (stage.dumper if type(stage).dump is Mapping.dump else stage.dump) for stage in reversed(stages)
+        ]
+
+        chained = Mapping(_chain_of(loaders), _chain_of(dumpers))
+        chained.stages = tuple(stages)
+        chained._recipe = (Mapping.chain, chained.stages, {})
+        return chained
 
     @classmethod
     def none_aware_for(cls, value_type):
-        return cls(none_aware_loader_of(value_type), none_aware_dumper_of(value_type))
+        return cls(none_aware_loader_of(value_type), none_aware_dumper_of(value_type), value_type=value_type)
+
+
+# strptime directives of fixed-width numbers, and where they go in the datetime constructor
+_datetime_directives = {
+    'Y': (0, '([0-9]{4})'),
+    'm': (1, '([0-9]{2})'),
+    'd': (2, '([0-9]{2})'),
+    'H': (3, '([0-9]{2})'),
+    'M': (4, '([0-9]{2})'),
+    'S': (5, '([0-9]{2})'),
+}
+
+# formats for which a fully matched string means the same to datetime.fromisoformat as to strptime
+_iso_formats = ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S')
+
+
+def _datetime_matcher_of(fmt):
+    """
+    Returns a function that parses strings in format ``fmt`` without strptime, or ``None`` if
+    the format has directives other than zero-padded numbers.
+    The function returns ``None`` for strings it can't parse -- strptime is more lenient, so
+    these must still be tried with strptime.
+
+    The function has a ``many`` attribute that parses a list of strings with one regular expression
+    over all of them, returning ``None`` if any of them can't be parsed.
+    """
+    import datetime as dt
+    import re
+
+    pattern = []
+    positions = []
+    parts = re.split(r'(%.)', fmt)
+    for part in parts:
+        if part.startswith('%') and len(part) == 2:
+            directive = _datetime_directives.get(part[1])
+            if directive is None or directive[0] in positions:
+                return None
+            positions.append(directive[0])
+            pattern.append(directive[1])
+        else:
+            pattern.append(re.escape(part))
+
+    fullmatch = re.compile(''.join(pattern)).fullmatch
+    findall = re.compile('^{}$'.format(''.join(pattern)), re.MULTILINE).findall
+
+    if positions == list(range(len(positions))):
+        def to_datetime(groups):
+            return dt.datetime(*map(int, groups))
+
+    else:
+        def to_datetime(groups):
+            args = [1900, 1, 1, 0, 0, 0]
+            for position, group in zip(positions, groups):
+                args[position] = int(group)
+            return dt.datetime(*args)
+
+    if fmt in _iso_formats and hasattr(dt.datetime, 'fromisoformat'):
+        fromisoformat = dt.datetime.fromisoformat
+
+        def matcher(raw_value):
+            if fullmatch(raw_value) is None:
+                return None
+            return fromisoformat(raw_value)
+
+        def convert_all(raw_values, matches):
+            return list(map(fromisoformat, raw_values))
+
+    else:
+        def matcher(raw_value):
+            match = fullmatch(raw_value)
+            if match is None:
+                return None
+            return to_datetime(match.groups())
+
+        def convert_all(raw_values, matches):
+            if len(positions) == 1:
+                # findall returns the group itself, not a tuple of groups
+                matches = [(match,) for match in matches]
+            return list(map(to_datetime, matches))
+
+    def many(raw_values):
+        try:
+            text = '\n'.join(raw_values)
+        except TypeError:
+            return None
+        # a string with a line break would match as two
+        if not raw_values or text.count('\n') != len(raw_values) - 1:
+            return None
+        matches = findall(text)
+        if len(matches) != len(raw_values):
+            return None
+        try:
+            return convert_all(raw_values, matches)
+        except ValueError:
+            return None
+
+    matcher.many = many
+    return matcher
 
 
 def datetime_mapping(*formats, default_format='%Y-%m-%d %H:%M:%S', is_date=False):
+    """
+    Formats are tried in order, starting with the one that matched the previous value,
+    so the formats should not be ambiguous.
+    """
+    import datetime as dt
+
+    recipe = (datetime_mapping, formats, {'default_format': default_format, 'is_date': is_date})
     formats = formats if formats else [default_format]
+    matchers = [_datetime_matcher_of(f) for f in formats]
+
+    # order in which to try the formats, by the index of the last matched format
+    attempts = [[i] + [j for j in range(len(formats)) if j != i] for i in range(len(formats))]
+    last_matched = [0]
 
     def loader(raw_value):
-        value = -1
         last_exc = None
 
         if isinstance(raw_value, dt.datetime):
@@ -74,39 +300,169 @@ def datetime_mapping(*formats, default_format='%Y-%m-%d %H:%M:%S', is_date=False
         elif isinstance(raw_value, dt.date):
             return dt.datetime(raw_value.year, raw_value.month, raw_value.day)
 
-        for f in formats:
+        for i in attempts[last_matched[0]]:
+            matcher = matchers[i]
+            if matcher is not None and isinstance(raw_value, str):
+                try:
+                    value = matcher(raw_value)
+                except ValueError as e:
+                    # Out of range values that strptime wouldn't accept either
+                    last_exc = e
+                    continue
+                if value is not None:
+                    last_matched[0] = i
+                    return value
+
             try:
-                value = dt.datetime.strptime(raw_value, f)
+                value = dt.datetime.strptime(raw_value, formats[i])
             except Exception as e:
                 last_exc = e
+                continue
 
-        if value == -1:
-            raise last_exc
-        else:
+            last_matched[0] = i
             return value
 
+        raise last_exc
+
+    def batch_loader(raw_values):
+        matcher = matchers[last_matched[0]]
+        if matcher is not None:
+            values = matcher.many(raw_values)
+            if values is not None:
+                return values
+
+        values = []
+        for raw_value in raw_values:
+            matcher = matchers[last_matched[0]]
+            value = None
+            if matcher is not None and type(raw_value) is str:
+                try:
+                    value = matcher(raw_value)
+                except ValueError:
+                    pass
+            values.append(loader(raw_value) if value is None else value)
+        return values
+
     def dumper(value):
         if value is None:
             return value
         return value.strftime(formats[0])
 
-    return Mapping(loader, dumper)
+    mapping = Mapping(loader, dumper, batch_loader=batch_loader)
+    mapping._recipe = recipe
+    return mapping
 
 
 def date_mapping(*formats, default_format='%Y-%m-%d', is_date=True):
     return datetime_mapping(*formats, default_format=default_format, is_date=is_date)
 
 
-def list_mapping(item_mapping=str):
-    def loader(raw_value):
-        return [item_mapping(item) for item in list(raw_value)]
+# array.array type codes of item types that lists can be loaded into
+_array_typecodes = {int: 'q', float: 'd'}
 
-    def dumper(value):
-        if value is None:
-            return value
-        return [dump_for_mapping(item_mapping, item) for item in value]
 
-    return Mapping(loader, dumper)
+def list_mapping(item_mapping=str, as_array=None):
+    """
+    Lists of primitive items (``int``, ``str``, ``float``, ``bool`` or ``Mappings.int`` and the like)
+    are converted with a single ``map`` call and dumped without calling a dumper per item.
+
+    Lists of ``int`` or ``float`` items can be loaded into compact typed arrays instead of lists:
+    ``as_array='array'`` returns an :class:`array.array`, ``as_array='numpy'`` a numpy array.
+    """
+    recipe = (list_mapping, (item_mapping,), {'as_array': as_array})
+
+    plain_mapping = isinstance(item_mapping, Mapping) and (type(item_mapping).load, type(item_mapping).dump) == (
+        Mapping.load, Mapping.dump
+    )
+    if item_mapping in primitive_types:
+        item_type = item_mapping
+        none_aware = False
+    elif plain_mapping:
+        item_type = item_mapping.extras.get('value_type')
+        none_aware = True
+    else:
+        item_type = None
+        none_aware = False
+
+    if as_array is not None:
+        if item_type not in _array_typecodes:
+            raise ValueError('as_array requires int or float items')
+        if as_array == 'numpy':
+            import numpy
+            dtype = numpy.int64 if item_type is int else numpy.float64
+
+            def to_array(values):
+                return numpy.array(values, dtype=dtype)
+
+        elif as_array == 'array':
+            import array
+            typecode = _array_typecodes[item_type]
+
+            def to_array(values):
+                return array.array(typecode, values)
+
+        else:
+            raise ValueError('as_array must be None, "array" or "numpy", not {!r}'.format(as_array))
+
+    if item_type is None:
+        def load_items(raw_value):
+            return [item_mapping(item) for item in list(raw_value)]
+
+    elif none_aware:
+        def load_items(raw_value):
+            # an iterator would be partly consumed by the failed first attempt
+            items = list(raw_value)
+            try:
+                return list(map(item_type, items))
+            except Exception:
+                # None items, or a mapping error that has to be raised by the item mapping
+                return [item_mapping(item) for item in items]
+
+    else:
+        def load_items(raw_value):
+            return list(map(item_type, raw_value))
+
+    if as_array is None:
+        loader = load_items
+    else:
+        def loader(raw_value):
+            return to_array(load_items(raw_value))
+
+    if item_mapping in primitive_types:
+        def dumper(value):
+            if value is None:
+                return value
+            if hasattr(value, 'tolist'):
+                # numpy array or array.array
+                return value.tolist()
+            return list(value)
+    elif none_aware and getattr(item_mapping.dumper, 'none_aware_type', None) in primitive_types:
+        dump_item = item_mapping.dumper
+        passthrough = {item_mapping.dumper.none_aware_type, type(None)}
+
+        def dumper(value):
+            if value is None:
+                return value
+            if hasattr(value, 'tolist'):
+                value = value.tolist()
+            if set(map(type, value)) <= passthrough:
+                # none-aware conversion wouldn't change any item
+                return list(value)
+            return list(map(dump_item, value))
+
+    else:
+        dump_item = getattr(item_mapping, 'dump', str)
+
+        def dumper(value):
+            if value is None:
+                return value
+            if hasattr(value, 'tolist'):
+                value = value.tolist()
+            return list(map(dump_item, value))
+
+    mapping = Mapping(loader, dumper)
+    mapping._recipe = recipe
+    return mapping
 
 
 class Mappings:
@@ -0,0 +1,178 @@
+from .field import Field
+from .mappings import Mapping
+
+
+def nested_mapping(schema):
+    """
+    Mapping that loads a dictionary with ``schema`` and dumps an instance with it.
+    """
+    def loader(raw_value):
+        if schema._compiled_fields != schema.fields:
+            schema.compile()
+        content = schema._load_resolved(schema._resolve(raw_value, None))
+        if schema.instance_factory is None:
+            return content
+        return schema.instance_factory(**content)
+
+    mapping = Mapping(loader, schema.dump, schema=schema)
+    mapping._recipe = (nested_mapping, (schema,), {})
+    return mapping
+
+
+def nested_list_mapping(schema):
+    """
+    Mapping that loads a list of dictionaries with ``schema`` and dumps a list of instances with it.
+    """
+    load_item = nested_mapping(schema).loader
+
+    def loader(raw_value):
+        return [load_item(item) for item in raw_value]
+
+    def dumper(value):
+        if value is None:
+            return value
+        return schema.dump_many(value)
+
+    mapping = Mapping(loader, dumper, schema=schema)
+    mapping._recipe = (nested_list_mapping, (schema,), {})
+    return mapping
+
+
+class NestedField(Field):
+    """
+    A field whose value is a dictionary loaded with another :class:`.Schema`.
+
+    Unlike passing the schema as the ``mapping`` of a plain :class:`.Field`, the nested schema is loaded
+    without going through the generic mapping error handling of every level. An error in a nested field
+    is raised as it is, with the path to it, for example ``'order.customer.email'``, as its name.
+    """
+
+    def __init__(self, name=None, schema=None, **kwargs):
+        if schema is None:
+            raise ValueError('NestedField {!r} requires a schema'.format(name))
+        self.schema = schema
+        kwargs['mapping'] = self._mapping_of(schema)
+        super().__init__(name, **kwargs)
+
+    _mapping_of = staticmethod(nested_mapping)
+
+    def clone(self, reverse=False, **overrides):
+        overrides.setdefault('schema', self.schema.reverse() if reverse else self.schema)
+        return super().clone(reverse=reverse, **overrides)
+
+    def load(self, raw_value):
+        if raw_value is None:
+            if self.nullable:
+                return raw_value
+            else:
+                raise self.Invalid(self.name, reason='nullable')
+
+        if not isinstance(raw_value, dict):
+            raise self.Invalid(self.name, reason='mapping')
+
+        try:
+            value = self.mapping.loader(raw_value)
+        except Field.Error as exc:
+            exc._prefixes = (self.name,) + exc._prefixes
+            raise
+
+        if self._constraints:
+            value, reason = self._check(raw_value, value)
+            if reason is not None:
+                raise self.Invalid(self.name, reason=reason)
+
+        return value
+
+    def try_load(self, raw_value):
+        if raw_value is None:
+            if self.nullable:
+                return raw_value, None
+            else:
+                return None, [(self.name, 'nullable')]
+
+        if not isinstance(raw_value, dict):
+            return None, [(self.name, 'mapping')]
+
+        value, errors = self.schema.try_load(raw_value)
+        if errors:
+            return None, [('{}.{}'.format(self.name, name), reason) for name, reason in errors]
+
+        value, reason = self._check(raw_value, value)
+        if reason is not None:
+            return None, [(self.name, reason)]
+
+        return value, None
+
+
+class NestedListField(NestedField):
+    """
+    A field whose value is a list of dictionaries, each loaded with another :class:`.Schema`.
+    Paths of errors include the index of the item, for example ``'lines.3.sku'``.
+    """
+
+    _mapping_of = staticmethod(nested_list_mapping)
+
+    def load(self, raw_value):
+        if raw_value is None:
+            if self.nullable:
+                return raw_value
+            else:
+                raise self.Invalid(self.name, reason='nullable')
+
+        if not isinstance(raw_value, (list, tuple)):
+            raise self.Invalid(self.name, reason='mapping')
+
+        schema = self.schema
+        if schema._compiled_fields != schema.fields:
+            schema.compile()
+        resolve = schema._resolve
+        load_resolved = schema._load_resolved
+        instance_factory = schema.instance_factory
+        value = []
+        for index, raw_item in enumerate(raw_value):
+            if not isinstance(raw_item, dict):
+                raise self.Invalid('{}.{}'.format(self.name, index), reason='mapping')
+            try:
+                content = load_resolved(resolve(raw_item, None))
+            except Field.Error as exc:
+                exc._prefixes = (self.name, index) + exc._prefixes
+                raise
+            value.append(content if instance_factory is None else instance_factory(**content))
+
+        if self._constraints:
+            value, reason = self._check(raw_value, value)
+            if reason is not None:
+                raise self.Invalid(self.name, reason=reason)
+
+        return value
+
+    def try_load(self, raw_value):
+        if raw_value is None:
+            if self.nullable:
+                return raw_value, None
+            else:
+                return None, [(self.name, 'nullable')]
+
+        if not isinstance(raw_value, (list, tuple)):
+            return None, [(self.name, 'mapping')]
+
+        value = []
+        errors = []
+        for index, raw_item in enumerate(raw_value):
+            if not isinstance(raw_item, dict):
+                errors.append(('{}.{}'.format(self.name, index), 'mapping'))
+                continue
+            item, item_errors = self.schema.try_load(raw_item)
+            if item_errors:
+                errors.extend(('{}.{}.{}'.format(self.name, index, name), reason) for name, reason in item_errors)
+            else:
+                value.append(item)
+
+        if errors:
+            return None, errors
+
+        value, reason = self._check(raw_value, value)
+        if reason is not None:
+            return None, [(self.name, reason)]
+
+        return value, None
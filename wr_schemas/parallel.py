@@ -0,0 +1,89 @@
+import collections
+import itertools
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from .batch import load_many
+
+# (key, state) of the call that the worker process last worked on, see worker_state
+_worker = None
+
+_calls = itertools.count()
+
+
+def new_call_key():
+    """
+    Returns a key that identifies one parallel call, for :func:`worker_state`.
+    """
+    return os.getpid(), next(_calls)
+
+
+def worker_state(key, payload, setup):
+    """
+    Returns the state of the call ``key`` in a worker process, ``setup(*pickle.loads(payload))``
+    built on the first chunk of the call that the process gets.
+
+    ProcessPoolExecutor has no initializer before Python 3.7, so the pickled arguments are sent
+    with every chunk instead, and unpickled once per process.
+    """
+    global _worker
+    if _worker is None or _worker[0] != key:
+        # release the state of the previous call before building the new one
+        _worker = None
+        _worker = key, setup(*pickle.loads(payload))
+    return _worker[1]
+
+
+def _setup_schema(schema):
+    # Instances are created in the parent process, instance factories may not be picklable
+    schema.instance_factory = None
+    return schema
+
+
+def _load_chunk(key, payload, rows, start, errors):
+    schema = worker_state(key, payload, _setup_schema)
+    if errors in ('raise', 'skip'):
+        return load_many(schema, rows, errors=errors, start=start), []
+    collected = []
+    return load_many(schema, rows, errors=collected, start=start), collected
+
+
+def parallel_load(schema, rows, workers=None, chunksize=1000, errors='raise'):
+    """
+    Implementation of :meth:`.Schema.parallel_load`.
+    """
+    workers = workers or os.cpu_count() or 1
+    policy = errors if errors in ('raise', 'skip') else 'collect'
+    instance_factory = schema.instance_factory
+    rows = iter(rows)
+    pending = collections.deque()
+
+    key = new_call_key()
+    payload = pickle.dumps((schema,))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            start = 0
+            while True:
+                while len(pending) < 2 * workers:
+                    chunk = list(itertools.islice(rows, chunksize))
+                    if not chunk:
+                        break
+                    pending.append(executor.submit(_load_chunk, key, payload, chunk, start, policy))
+                    start += len(chunk)
+
+                if not pending:
+                    return
+
+                contents, chunk_errors = pending.popleft().result()
+                if chunk_errors:
+                    errors.extend(chunk_errors)
+                if instance_factory is None:
+                    yield from contents
+                else:
+                    for content in contents:
+                        yield instance_factory(**content)
+        finally:
+            for future in pending:
+                future.cancel()
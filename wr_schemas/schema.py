@@ -1,6 +1,10 @@
+import itertools
+
 from .field import Field
-from .utils import AttrDict
+from .mappings import Mapping
+from .utils import AttrDict, LazyRecord, Record
 from .utils import _nothing as nothing
+from .utils import derive, make_record_class, mutable_class_of
 
 
 class Schema:
@@ -20,21 +24,27 @@ class Schema:
                 raise KeyError(name)
 
         def __getattr__(self, name) -> Field:
-            for field in self._schema.fields:
-                if field.name == name:
-                    return field
-            raise AttributeError(name)
+            schema = self._schema
+            if schema._compiled_fields != schema.fields:
+                schema.compile()
+            try:
+                return schema._fields_by_name[name]
+            except KeyError:
+                raise AttributeError(name)
 
     instance_factory = AttrDict
     fields = ()
 
+    _load_plan = None
+    _fields_by_name = None
+    # copy of fields as they were when compiled, to compile again if they are changed
+    _compiled_fields = None
+    _instrumentation = None
+    _json_keys = None
+
     def __new__(cls, *fields, excluding=None, instance_factory=None, mixins=None):
         if mixins:
-            kls = type(
-                '{}+{}'.format(cls.__name__, '_'.join(m.__name__ for m in mixins)),
-                (cls,) + tuple(mixins),
-                {},
-            )
+            kls = _with_mixins(cls, tuple(mixins))
             schema_instance = kls()
         else:
             schema_instance = super().__new__(cls)
@@ -49,38 +59,391 @@ class Schema:
             excluding = [excluding]
         elif isinstance(excluding, (list, tuple)):
             excluding = excluding
-        if fields:
+        fields = fields or self.fields
+        if excluding:
             self.fields = [f for f in fields if f.name not in excluding and f not in excluding]
         else:
-            self.fields = [f for f in self.fields if f.name not in excluding and f not in excluding]
+            self.fields = list(fields)
 
         self.f = self.FieldsProxy(self)
+        self.compile()
+
+        if self.instance_factory is Record:
+            self.instance_factory = self.make_record_class()
+
+    def __reduce_ex__(self, protocol):
+        cls = mutable_class_of(type(self))
+        return _unpickle_schema, cls.__dict__.get('_mixins', (cls, ())), self.__getstate__()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in (
+            'f', '_load_plan', '_fields_by_name', '_positions_by_source_name', '_absent_positions', '_dump_plan',
+            '_json_keys', '_derived', '_compiled_fields',
+        ):
+            state.pop(name, None)
+        # Instrumentation is not carried over -- sinks are local to the process
+        state.pop('_instrumentation', None)
+        if self._instrumentation is not None:
+            for name in self._instrumentation.methods:
+                state.pop(name, None)
+        if getattr(self.instance_factory, '_generated', False):
+            state['instance_factory'] = Record
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.f = self.FieldsProxy(self)
+        if self.instance_factory is Record:
+            self.instance_factory = self.make_record_class()
+        self.compile()
+
+    def make_record_class(self, name=None):
+        """
+        Generates a :class:`.Record` subclass with ``__slots__`` for exactly the names of
+        :attr:`.fields`, suitable as :attr:`.instance_factory`. Passing ``instance_factory=Record``
+        to the schema does this automatically.
+        """
+        return make_record_class(name or '{}Record'.format(type(self).__name__), [f.name for f in self.fields])
+
+    def compile(self):
+        """
+        Builds the load plan for the current :attr:`.fields` so that :meth:`load` doesn't
+        have to dispatch through :class:`.Field` methods for every field on every call,
+        and the indexes of fields by name and by source name.
+
+        Called on construction, and again by the methods that use the plans if :attr:`.fields`
+        has been changed or replaced since. Call it yourself if you modify any of the fields.
+        """
+        self.__dict__.pop('_derived', None)
+        self._compiled_fields = self.fields[:]
+
+        factory = self.instance_factory
+        if getattr(factory, '_generated', False) and factory.__slots__ != tuple(f.name for f in self.fields):
+            # generated for the fields as they were before
+            self.instance_factory = self.make_record_class(factory.__name__)
+
+        self._load_plan = tuple(
+            (
+                f,
+                f.name,
+                tuple(f.source_names) if f.source_names else (f.name,),
+                f.load,
+                bool(f.forbidden),
+                bool(f.required),
+            )
+            for f in self.fields
+        )
+
+        self._fields_by_name = {}
+        self._positions_by_source_name = {}
+        self._absent_positions = set()
+        for position, (f, name, keys, load, forbidden, required) in enumerate(self._load_plan):
+            self._fields_by_name.setdefault(name, f)
+            for rank, key in enumerate(keys):
+                self._positions_by_source_name.setdefault(key, []).append((position, rank))
+            if not forbidden and (required or f._default_kind is not None):
+                self._absent_positions.add(position)
+
+        self._dump_plan = tuple(self._dump_entry(f) for f in self.fields)
+        self._json_keys = None
+
+        if self._instrumentation is not None:
+            self._load_plan, self._dump_plan = self._instrumentation.instrument_plans(self._load_plan, self._dump_plan)
+
+        return self
+
+    def instrument(self, sink, name=None):
+        """
+        Starts reporting timings of loads and dumps of the schema and each of its fields,
+        counts of invalid values and mapping errors, and sizes of payloads to ``sink``
+        -- see :mod:`wr_schemas.instrumentation`. The metrics are tagged with ``name``,
+        by default the name of the schema class.
+
+        Pass ``None`` as the sink to stop. A schema that isn't instrumented has no overhead.
+        """
+        from .instrumentation import Instrumentation
+
+        if self._instrumentation is not None:
+            self._instrumentation.uninstall()
+            self._instrumentation = None
+
+        if sink is not None:
+            self._instrumentation = Instrumentation(self, sink, name or type(self).__name__)
+            self._instrumentation.install()
+
+        return self.compile()
 
-    def load(self, dct=None, **extras):
+    @staticmethod
+    def _dump_entry(f):
+        """
+        Returns ``(name, dump name, dumper, passthrough types)`` for the dump plan.
+        Values of passthrough types are dumped as they are.
+        """
+        dump_name = f.source_names[0] if f.source_names else f.name
+        mapping = f.mapping
+        if type(f).dump is Field.dump and isinstance(mapping, Mapping) and type(mapping).dump is Mapping.dump:
+            value_type = mapping.extras.get('value_type')
+            if value_type is not None:
+                # none-aware conversion to value_type doesn't change None or values of exactly that type
+                return f.name, dump_name, mapping.dumper, (value_type, type(None))
+            return f.name, dump_name, mapping.dumper, ()
+        return f.name, dump_name, f.dump, ()
+
+    def _resolve(self, dct, extras):
+        """
+        Returns a list of ``(plan entry, raw value)`` for fields that have a value in the payload
+        (``extras`` taking precedence over ``dct``) or need a default or a required check,
+        in the order of :attr:`.fields`. Raw value is ``nothing`` for fields without a value.
+
+        If the payload has much fewer keys than the schema has fields, the payload keys are looked up
+        in the source name index instead of looking up every field in the payload.
+        """
+        plan = self._load_plan
+        resolved = []
+
+        if not extras and type(dct) is dict and len(dct) * 4 < len(plan):
+            found = {}
+            positions_by_source_name = self._positions_by_source_name
+            for key, raw_value in dct.items():
+                for position, rank in positions_by_source_name.get(key, ()):
+                    if position not in found or rank < found[position][0]:
+                        found[position] = (rank, raw_value)
+            for position in sorted(self._absent_positions.union(found)):
+                if position in found:
+                    resolved.append((plan[position], found[position][1]))
+                else:
+                    resolved.append((plan[position], nothing))
+            return resolved
+
+        absent_positions = self._absent_positions
+        for position, entry in enumerate(plan):
+            keys = entry[2]
+            raw_value = nothing
+            if extras:
+                for key in keys:
+                    if key in extras:
+                        raw_value = extras[key]
+                        break
+            if raw_value is nothing:
+                for key in keys:
+                    if key in dct:
+                        raw_value = dct[key]
+                        break
+            if raw_value is not nothing or position in absent_positions:
+                resolved.append((entry, raw_value))
+
+        return resolved
+
+    def _resolve_merged(self, merged):
+        """
+        Same as :meth:`._resolve`, but for values from several sources merged with :func:`.merge_sources`.
+        A field with several source names gets the value from the source of highest precedence
+        that has any of them.
+        """
+        resolved = []
+        absent_positions = self._absent_positions
+        for position, entry in enumerate(self._load_plan):
+            keys = entry[2]
+            if len(keys) == 1:
+                hit = merged.get(keys[0])
+            else:
+                hit = None
+                for key in keys:
+                    candidate = merged.get(key)
+                    if candidate is not None and (hit is None or candidate[0] < hit[0]):
+                        hit = candidate
+            if hit is not None:
+                resolved.append((entry, hit[1]))
+            elif position in absent_positions:
+                resolved.append((entry, nothing))
+        return resolved
+
+    def load(self, dct=None, *, collect_errors=False, lazy=False, **extras):
         """
         Similar to :meth:`Schema.from_request`, but instead the field values are read from
         the given dictionary.
+
+        With ``collect_errors=True`` nothing is raised for invalid payloads and
+        the result of :meth:`.try_load` is returned instead.
+
+        With ``lazy=True`` only required and forbidden fields are checked, and a :class:`.LazyRecord`
+        is returned in which each value is loaded on first access. :attr:`.instance_factory` is not used.
         """
 
-        content = {}
+        if collect_errors:
+            return self.try_load(dct, **extras)
 
-        for f in self.fields:  # type: Field
-            if f.has_value_in(extras):
-                f.set_value_in(content, f.load(f.get_value_in(extras)))
-            elif f.has_value_in(dct):
-                f.set_value_in(content, f.load(f.get_value_in(dct)))
-            elif f.forbidden:
-                continue
-            elif f.default is not nothing:
-                f.set_value_in(content, f.default)
-            elif f.required:
-                raise f.Missing(f.name, reason='required')
+        if self._compiled_fields != self.fields:
+            self.compile()
+
+        if lazy:
+            return LazyRecord(self._resolve(dct, extras))
+
+        content = self._load_resolved(self._resolve(dct, extras))
 
         if self.instance_factory is None:
             return content
         else:
             return self.instance_factory(**content)
 
+    def _load_resolved(self, resolved):
+        """
+        Loads the fields resolved by :meth:`._resolve` or :meth:`._resolve_merged`, returns the content dictionary.
+        """
+        content = {}
+
+        for (f, name, keys, load, forbidden, required), raw_value in resolved:
+            if raw_value is not nothing:
+                value = load(raw_value)
+                if forbidden:
+                    raise f.Forbidden(name, reason='forbidden')
+                content[name] = value
+            else:
+                default = f.default
+                if default is not nothing:
+                    content[name] = default
+                elif required:
+                    raise f.Missing(name, reason='required')
+
+        return content
+
+    def try_load(self, dct=None, **extras):
+        """
+        Loads the payload without failing on the first error.
+        Returns ``(instance, errors)`` -- ``(instance, None)`` if the payload is valid, otherwise
+        ``(None, errors)`` where ``errors`` lists ``(field path, reason)`` pairs of all invalid fields.
+        """
+
+        if self._compiled_fields != self.fields:
+            self.compile()
+
+        content = {}
+        errors = []
+
+        for (f, name, keys, load, forbidden, required), raw_value in self._resolve(dct, extras):
+            if raw_value is not nothing:
+                value, field_errors = f.try_load(raw_value)
+                if field_errors:
+                    errors.extend(field_errors)
+                elif forbidden:
+                    errors.append((name, 'forbidden'))
+                else:
+                    content[name] = value
+            else:
+                default = f.default
+                if default is not nothing:
+                    content[name] = default
+                elif required:
+                    errors.append((name, 'required'))
+
+        if errors:
+            return None, errors
+        elif self.instance_factory is None:
+            return content, None
+        else:
+            return self.instance_factory(**content), None
+
+    def load_many(self, data, *, as_columns=False, errors='raise'):
+        """
+        Loads many payloads at once, one field at a time over the whole column of values.
+        Mapping and constraint checks of primitive int and float fields are vectorised
+        if numpy is installed.
+
+        ``data`` is either an iterable of dictionaries (rows) or a dictionary of equally long
+        lists (columns) keyed by source names.
+
+        Returns a list of instances, or, if ``as_columns`` is set, a dictionary of columns keyed
+        by field names (numpy arrays for vectorised fields) in which missing values are ``None``.
+
+        ``errors`` decides what happens to invalid rows:
+
+         * ``'raise'`` -- the first error is raised, with :attr:`.Field.Error.row` set to the row index.
+         * ``'skip'`` -- invalid rows are left out.
+         * a list -- invalid rows are left out and ``(row index, field name, reason)`` is appended to it.
+        """
+        from .batch import load_many
+        return load_many(self, data, as_columns=as_columns, errors=errors)
+
+    def parallel_load(self, rows, *, workers=None, chunksize=1000, errors='raise'):
+        """
+        Loads an iterable of payloads in ``workers`` processes (by default as many as there are CPUs),
+        ``chunksize`` rows at a time with :meth:`.load_many`. The schema must be picklable.
+
+        This is a generator -- instances are yielded in input order, and only a couple of chunks
+        per worker are read ahead. ``errors`` works as in :meth:`.load_many`.
+        """
+        from .parallel import parallel_load
+        return parallel_load(self, rows, workers=workers, chunksize=chunksize, errors=errors)
+
+    def iter_load(self, rows, *, errors='raise', chunk_size=None):
+        """
+        Lazily loads an iterable of payloads, yielding one instance at a time,
+        so that memory use doesn't depend on the number of rows.
+
+        ``errors`` works as in :meth:`.load_many`. If ``chunk_size`` is set, rows are
+        loaded with :meth:`.load_many` that many at a time. Either way, the rows before
+        the first invalid one are yielded before its error is raised.
+        """
+        if chunk_size:
+            from .batch import load_many
+            rows = iter(rows)
+            start = 0
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    return
+                try:
+                    loaded = load_many(self, chunk, errors=errors, start=start)
+                except Field.Error as exc:
+                    # the rows before the invalid one are valid, and would have been yielded one by one
+                    yield from load_many(self, chunk[:exc.row - start], start=start)
+                    raise
+                yield from loaded
+                start += len(chunk)
+
+        for i, row in enumerate(rows):
+            try:
+                instance = self.load(row)
+            except Field.Error as exc:
+                if errors == 'raise':
+                    exc.row = i
+                    raise
+                elif errors != 'skip':
+                    errors.append((i, exc.name, exc.reason))
+                continue
+            yield instance
+
+    def load_json(self, data, **extras):
+        """
+        Decodes the JSON object in ``data`` (``bytes`` or ``str``) with :func:`json.loads`, or the decoder
+        set with :func:`.jsonio.set_json_decoder`, and loads it, taking the same keyword arguments as :meth:`.load`.
+        Invalid JSON raises :class:`.Field.Invalid` with reason ``'json'`` and no field name.
+
+        None of the decoders can skip keys, but keys that aren't source names of fields are
+        never looked at after decoding.
+        """
+        from .jsonio import load_json
+        return load_json(self, data, extras)
+
+    def iter_load_json(self, lines, *, errors='raise'):
+        """
+        Lazily loads JSON lines -- an iterable of ``bytes`` or ``str``, for example a file --
+        yielding one instance at a time. Blank lines are skipped. ``errors`` works as in :meth:`.load_many`,
+        with the index of the line as the row index, and lines that aren't JSON objects
+        are errors with reason ``'json'``.
+        """
+        from .jsonio import iter_load_json
+        return iter_load_json(self, lines, errors=errors)
+
+    def iter_dump(self, values):
+        """
+        Lazily dumps an iterable of instances, yielding one dictionary at a time.
+        """
+        dump = self.dump
+        for value in values:
+            yield dump(value)
+
     def __call__(self, dct=None, **extras):
         return self.load(dct=dct, **extras)
 
@@ -88,16 +451,108 @@ class Schema:
         if value is None:
             return value
 
-        assert isinstance(value, dict)
+        if self._compiled_fields != self.fields:
+            self.compile()
 
         serialized = {}
-        for f in self.fields:  # type: Field
-            if f.name in value:
-                dump_name = f.source_names[0] if f.source_names else f.name
-                serialized[dump_name] = f.dump(value[f.name])
+
+        if isinstance(value, dict):
+            for name, dump_name, dumper, passthrough in self._dump_plan:
+                if name in value:
+                    v = value[name]
+                    serialized[dump_name] = v if type(v) in passthrough else dumper(v)
+        else:
+            assert isinstance(value, Record)
+            for name, dump_name, dumper, passthrough in self._dump_plan:
+                v = getattr(value, name, nothing)
+                if v is not nothing:
+                    serialized[dump_name] = v if type(v) in passthrough else dumper(v)
 
         return serialized
 
+    def dump_many(self, values):
+        """
+        Dumps a list of instances, same as ``[schema.dump(v) for v in values]``
+        but without the per-item overhead.
+        """
+        if self._compiled_fields != self.fields:
+            self.compile()
+        plan = self._dump_plan
+        dumped = []
+        for value in values:
+            if value is None or not isinstance(value, dict):
+                dumped.append(self.dump(value))
+                continue
+            serialized = {}
+            for name, dump_name, dumper, passthrough in plan:
+                if name in value:
+                    v = value[name]
+                    serialized[dump_name] = v if type(v) in passthrough else dumper(v)
+            dumped.append(serialized)
+        return dumped
+
+    def dump_json(self, value):
+        """
+        Dumps the instance to JSON ``bytes`` that decode to ``schema.dump(value)``.
+
+        Uses orjson on the result of :meth:`.dump` if it is installed, so the dumped dictionary is still
+        built first, falling back to json for what orjson can't encode (integers over 64 bits, dict keys
+        other than ``str``). orjson writes non-ASCII characters as UTF-8 rather than ``\\u`` escapes,
+        and ``NaN`` and infinite floats as ``null``.
+
+        Without orjson, the output is the same as ``json.dumps(schema.dump(value))`` without the spaces,
+        encoded as ASCII. The values are encoded one by one after the field names, which are escaped on
+        the first call, without building the dumped dictionary.
+        """
+        from .jsonio import dump_json
+        return dump_json(self, value)
+
+    def dump_json_many(self, values):
+        """
+        Dumps a list of instances to a JSON array, same as :meth:`.dump_json` of each.
+        """
+        from .jsonio import dump_json_many
+        return dump_json_many(self, values)
+
     def reverse(self):
-        fields = [f.clone(reverse=True) for f in self.fields]
-        return self.__class__(*fields)
+        """
+        Returns the reversed schema. The same schema is returned until this schema is compiled again,
+        so it can't be changed -- make a new :class:`.Schema` of its fields to change it.
+        """
+        return derive(self, ('reverse',), lambda: mutable_class_of(type(self))(*[f.reverse() for f in self.fields]))
+
+    def without(self, *excluding):
+        """
+        Returns a schema of the same fields, except those in ``excluding`` (names or fields),
+        and the same :attr:`.instance_factory`. The same schema is returned for the same arguments
+        until this schema is compiled again, so it can't be changed.
+        """
+        def build():
+            instance_factory = Record if getattr(self.instance_factory, '_generated', False) else self.instance_factory
+            return mutable_class_of(type(self))(*self.fields, excluding=list(excluding), instance_factory=instance_factory)
+
+        return derive(self, ('without', excluding), build)
+
+
+_mixin_classes = {}
+
+
+def _with_mixins(cls, mixins):
+    """
+    Returns the subclass of schema class ``cls`` with ``mixins``, created once per combination
+    so that schemas with mixins can be pickled.
+    """
+    key = (cls, mixins)
+    if key not in _mixin_classes:
+        _mixin_classes[key] = type(
+            '{}+{}'.format(cls.__name__, '_'.join(m.__name__ for m in mixins)),
+            (cls,) + mixins,
+            {'_mixins': key},
+        )
+    return _mixin_classes[key]
+
+
+def _unpickle_schema(cls, mixins):
+    if mixins:
+        cls = _with_mixins(cls, mixins)
+    return object.__new__(cls)
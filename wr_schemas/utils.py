@@ -8,7 +8,285 @@ class AttrDict(dict):
         self[name] = value
 
 
-_nothing = object()
+class Record:
+    """
+    Base class for ``__slots__``-based instances with an attribute per field,
+    see :meth:`.Schema.make_record_class`. Fields that weren't loaded are left unset.
+    Supports the ``in`` and ``[]`` lookups of a dictionary so that it can be dumped.
+    """
+
+    __slots__ = ()
+
+    # Set on classes generated by make_record_class
+    _generated = False
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def __contains__(self, name):
+        return name in self.__slots__ and hasattr(self, name)
+
+    def __getitem__(self, name):
+        if name in self.__slots__:
+            try:
+                return getattr(self, name)
+            except AttributeError:
+                pass
+        raise KeyError(name)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return self.__slots__ == other.__slots__ and self._asdict() == other._asdict()
+        elif isinstance(other, dict):
+            return self._asdict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{}({})'.format(
+            type(self).__name__,
+            ', '.join('{}={!r}'.format(k, v) for k, v in self._asdict().items()),
+        )
+
+    def _asdict(self):
+        values = {}
+        for name in self.__slots__:
+            try:
+                values[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        return values
+
+
+class LazyRecord(Record):
+    """
+    Instance returned by :meth:`.Schema.load` with ``lazy=True``. Required and forbidden fields
+    are checked, and defaults are set, on creation, but the values in the payload are loaded
+    (mapped and checked) only when they are first accessed, and then remembered.
+    :meth:`.validate_all` loads all of them.
+    """
+
+    __slots__ = ('_names', '_raw_values', '_values')
+
+    def __init__(self, resolved):
+        names = []
+        raw_values = {}
+        values = {}
+        for (f, name, keys, load, forbidden, required), raw_value in resolved:
+            if raw_value is not _nothing:
+                if forbidden:
+                    raise f.Forbidden(name, reason='forbidden')
+                raw_values[name] = (load, raw_value)
+            else:
+                default = f.default
+                if default is _nothing:
+                    if required:
+                        raise f.Missing(name, reason='required')
+                    continue
+                values[name] = default
+            names.append(name)
+        self._names = tuple(names)
+        self._raw_values = raw_values
+        self._values = values
+
+    def __getattr__(self, name):
+        if name in LazyRecord.__slots__:
+            raise AttributeError(name)
+        values = self._values
+        if name in values:
+            return values[name]
+        try:
+            load, raw_value = self._raw_values[name]
+        except KeyError:
+            raise AttributeError(name)
+        value = values[name] = load(raw_value)
+        self._raw_values.pop(name, None)
+        return value
+
+    def __setattr__(self, name, value):
+        if name in LazyRecord.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            self._raw_values.pop(name, None)
+            self._values[name] = value
+            if name not in self._names:
+                self._names += (name,)
+
+    def __contains__(self, name):
+        return name in self._values or name in self._raw_values
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return self._asdict() == (other if isinstance(other, dict) else other._asdict())
+        return NotImplemented
+
+    def validate_all(self):
+        """
+        Loads all values that haven't been loaded yet, raising the error of the first invalid one.
+        Returns the record.
+        """
+        for name in list(self._raw_values):
+            getattr(self, name)
+        return self
+
+    def _asdict(self):
+        self.validate_all()
+        return {name: self._values[name] for name in self._names}
+
+
+def derive(obj, key, build):
+    """
+    Returns ``build()``, remembered in ``obj`` under ``key`` so that the same derivation
+    returns the same object, which is therefore frozen (see :func:`freeze`).
+    Not remembered, nor frozen, if ``key`` isn't hashable.
+    The derivations are forgotten when ``obj`` is compiled again.
+    """
+    derived = obj.__dict__.get('_derived')
+    if derived is None:
+        derived = obj.__dict__['_derived'] = {}
+    try:
+        return derived[key]
+    except KeyError:
+        pass
+    except TypeError:
+        return build()
+    value = derived[key] = freeze(build())
+    return value
+
+
+def _refuse_list_change(self, *args, **kwargs):
+    raise TypeError('can not change a list of a derived object which is shared by everyone who derives it')
+
+
+class FrozenList(list):
+    """
+    List of a frozen object that can't be changed.
+    """
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _refuse_list_change
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _refuse_list_change
+
+    def __reduce_ex__(self, protocol):
+        # unpickled as an ordinary list, like the object it belongs to
+        return list, (list(self),)
+
+
+# frozen subclasses by the class they are derived from
+_frozen_classes = {}
+
+
+def _refuse_change(self, name):
+    raise AttributeError(
+        'can not change {!r} of a derived {} which is shared by everyone who derives it, '
+        'make a new one from it instead'.format(name, type(self).__name__)
+    )
+
+
+def _set_private(self, name, value):
+    # private attributes hold what is compiled from the public ones
+    if not name.startswith('_'):
+        _refuse_change(self, name)
+    type(self)._mutable_class.__setattr__(self, name, value)
+
+
+def _delete_private(self, name):
+    if not name.startswith('_'):
+        _refuse_change(self, name)
+    type(self)._mutable_class.__delattr__(self, name)
+
+
+def _new_mutable(cls, *args):
+    return cls.__new__(cls, *args)
+
+
+def _reduce_frozen(self, protocol):
+    # unpickled as a mutable instance of the original class
+    mutable_class = type(self)._mutable_class
+    reduced = mutable_class.__reduce_ex__(self, protocol)
+    args = reduced[1]
+    if args and args[0] is type(self):
+        reduced = (_new_mutable, (mutable_class,) + tuple(args[1:])) + tuple(reduced[2:])
+    return reduced
+
+
+def freeze(obj):
+    """
+    Makes ``obj`` immutable: its public lists become :class:`FrozenList`, and setting or deleting its public
+    attributes raises ``AttributeError``. Private attributes can still be set, so that the object can be
+    compiled again. The object becomes an instance of a subclass of its class, which only overrides
+    ``__setattr__`` and ``__delattr__``, so instances that aren't frozen pay nothing for it.
+    Use :func:`mutable_class_of` to compare the class of an object that may be frozen.
+    """
+    cls = type(obj)
+    frozen_class = _frozen_classes.get(cls)
+    if frozen_class is None:
+        frozen_class = _frozen_classes[cls] = type(cls.__name__, (cls,), {
+            '__module__': cls.__module__,
+            '__qualname__': cls.__qualname__,
+            '__setattr__': _set_private,
+            '__delattr__': _delete_private,
+            '__reduce_ex__': _reduce_frozen,
+            '_mutable_class': cls,
+        })
+    for name, value in list(obj.__dict__.items()):
+        if type(value) is list and not name.startswith('_'):
+            obj.__dict__[name] = FrozenList(value)
+    obj.__class__ = frozen_class
+    return obj
+
+
+def mutable_class_of(cls):
+    """
+    Returns the class that ``cls`` is the frozen subclass of, or ``cls`` itself.
+    """
+    return cls.__dict__.get('_mutable_class', cls)
+
+
+def make_record_class(name, field_names):
+    field_names = tuple(field_names)
+    for field_name in field_names:
+        if not field_name.isidentifier():
+            raise ValueError('Field name {!r} can not be a record attribute'.format(field_name))
+    return type(name, (Record,), {'__slots__': field_names, '_generated': True})
+
+
+def merge_sources(*sources):
+    """
+    Merges dictionary-like sources of values, given in order of precedence, into a dictionary
+    of ``key: (precedence, value)`` where the value is taken from the first source that has the key.
+    For multi-value dictionaries like werkzeug's ``MultiDict`` the first value of each key is taken.
+    """
+    merged = {}
+    for precedence, source in enumerate(sources):
+        if not source:
+            continue
+        for key, value in source.items():
+            if key not in merged:
+                merged[key] = (precedence, value)
+    return merged
+
+
+class _Nothing:
+    def __reduce__(self):
+        # pickled by reference, so that it is the same object in the process that unpickles it
+        return '_nothing'
+
+
+_nothing = _Nothing()
 
 
 def dump_for_mapping(mapping, value):